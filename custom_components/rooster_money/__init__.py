@@ -1,11 +1,13 @@
 """The Natwest Rooster Money integration."""
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 
 from pyroostermoney import RoosterMoney
 from pyroostermoney.child import StandingOrder
 from pyroostermoney.exceptions import InvalidAuthError
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
@@ -16,32 +18,72 @@ from homeassistant.core import (
     SupportsResponse,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
-
-from .const import DOMAIN
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .cassette import RoosterReplay, remove_cassettes
+from .images import RoosterImageView, remove_image_dir
+from .const import DEFAULT_UPDATE_INTERVAL, DOMAIN, JOB_HISTORY_RETENTION_DAYS
+from .helpers import family_overview
+from .job_history import async_remove_history
+from .profiling import async_profile_refreshes
+from .push import async_setup_webhook
 from .update_coordinator import RoosterCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Natwest Rooster Money component."""
+    hass.http.register_view(RoosterImageView(hass))
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Natwest Rooster Money from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     try:
-        rooster = await RoosterMoney.create(
-            username=entry.data["username"],
-            password=entry.data["password"],
-            remove_card_information=entry.data.get("exclude_card_pin", True),
+        if entry.data.get("replay_cassette"):
+            # development only, serve all traffic from a recorded cassette
+            rooster = await RoosterReplay.create_from_cassette(
+                hass,
+                hass.config.path(entry.data["replay_cassette"]),
+                entry.data.get("replay_speed", 1.0),
+                accept_writes=entry.data.get("replay_accept_writes", False),
+            )
+        else:
+            rooster = await RoosterMoney.create(
+                username=entry.data["username"],
+                password=entry.data["password"],
+                remove_card_information=entry.data.get("exclude_card_pin", True),
+            )
+
+        hass.data[DOMAIN][entry.entry_id] = RoosterCoordinator(
+            hass,
+            rooster,
+            entry.data.get("update_interval", DEFAULT_UPDATE_INTERVAL),
+            entry.data.get("daily_request_budget", 0),
+            entry.data.get("queue_failed_writes", False),
+            entry.data.get("hedge_requests", False),
+            entry.data.get("job_history_days", JOB_HISTORY_RETENTION_DAYS),
         )
-
-        hass.data[DOMAIN][entry.entry_id] = RoosterCoordinator(hass, rooster)
+        await hass.data[DOMAIN][entry.entry_id].analytics.async_load()
+        await hass.data[DOMAIN][entry.entry_id].outbox.async_load()
+        await hass.data[DOMAIN][entry.entry_id].images.async_load()
+        await hass.data[DOMAIN][entry.entry_id].job_history.async_load()
         # no need to fetch initial data as pyroostermoney takes care of this when we call 'create'
     except InvalidAuthError:
         raise ConfigEntryAuthFailed
     except:
         raise CannotConnect
 
+    await async_setup_webhook(hass, entry, hass.data[DOMAIN][entry.entry_id])
+    async_register_services(hass)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -51,9 +93,135 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            for service in DOMAIN_SERVICES:
+                hass.services.async_remove(DOMAIN, service)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the files of a deleted config entry."""
+    await hass.async_add_executor_job(remove_image_dir, hass, entry.entry_id)
+    await hass.async_add_executor_job(remove_cassettes, hass, entry.entry_id)
+    await async_remove_history(hass, entry.entry_id)
+
+
+DOMAIN_SERVICES = [
+    "list_outbox",
+    "cancel_outbox_item",
+    "get_family_overview",
+    "profile",
+    "export_job_history",
+]
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the domain services."""
+    if hass.services.has_service(DOMAIN, "list_outbox"):
+        return
+
+    async def async_get_family_overview(call: ServiceCall) -> ServiceResponse:
+        """Return every family from cache, refreshing only stale data."""
+        families = []
+        for coordinator in hass.data[DOMAIN].values():
+            await coordinator.async_ensure_fresh(
+                timedelta(seconds=call.data["max_age"])
+            )
+            families.append(
+                family_overview(
+                    coordinator.rooster.family_account, coordinator.rooster.children
+                )
+            )
+        return {"families": families}
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profiles forced refreshes of every config entry."""
+        return {
+            "entries": [
+                await async_profile_refreshes(
+                    hass, coordinator, call.data["refreshes"], call.data["top"]
+                )
+                for coordinator in hass.data[DOMAIN].values()
+            ]
+        }
+
+    async def async_export_job_history(call: ServiceCall) -> ServiceResponse:
+        """Export the finished jobs of every config entry to a file."""
+        since = call.data.get("since")
+        return {
+            "entries": [
+                await coordinator.job_history.async_export(
+                    call.data["format"], dt_util.as_utc(since) if since else None
+                )
+                for coordinator in hass.data[DOMAIN].values()
+            ]
+        }
+
+    async def async_list_outbox(call: ServiceCall) -> ServiceResponse:
+        """List the writes waiting to be sent."""
+        return {
+            "items": [
+                item
+                for coordinator in hass.data[DOMAIN].values()
+                for item in coordinator.outbox.items
+            ]
+        }
+
+    async def async_cancel_outbox_item(call: ServiceCall) -> None:
+        """Cancel a write waiting to be sent."""
+        for coordinator in hass.data[DOMAIN].values():
+            if coordinator.outbox.async_cancel(call.data["item_id"]):
+                return
+        raise HomeAssistantError(f"Unknown outbox item {call.data['item_id']}")
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_family_overview",
+        async_get_family_overview,
+        schema=vol.Schema({vol.Optional("max_age", default=300): cv.positive_int}),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        async_profile,
+        schema=vol.Schema(
+            {
+                vol.Optional("refreshes", default=1): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=10)
+                ),
+                vol.Optional("top", default=20): cv.positive_int,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "export_job_history",
+        async_export_job_history,
+        schema=vol.Schema(
+            {
+                vol.Optional("format", default="csv"): vol.In(["csv", "jsonl"]),
+                vol.Optional("since"): cv.datetime,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "list_outbox",
+        async_list_outbox,
+        schema=vol.Schema({}),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "cancel_outbox_item",
+        async_cancel_outbox_item,
+        schema=vol.Schema({vol.Required("item_id"): str}),
+    )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
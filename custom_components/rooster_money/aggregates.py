@@ -0,0 +1,101 @@
+"""Household totals and job boards for Rooster Money."""
+from __future__ import annotations
+
+from pyroostermoney import RoosterMoney
+from pyroostermoney.child import Job
+from pyroostermoney.enum import JobState
+
+from homeassistant.core import callback
+
+# jobs whose reward has not been paid yet
+PENDING_JOB_STATES = {JobState.TODO, JobState.AWAITING_APPROVAL, JobState.OVERDUE}
+
+JOB_BOARD_COLUMNS = {
+    JobState.TODO: "todo",
+    JobState.AWAITING_APPROVAL: "awaiting_approval",
+    JobState.APPROVED: "approved",
+    JobState.OVERDUE: "expired",
+    JobState.NOT_DONE: "expired",
+    JobState.SKIPPED: "expired",
+}
+
+
+class JobBoard:
+    """Job counters per state, adjusted from the delta between snapshots."""
+
+    def __init__(self) -> None:
+        """Init the board."""
+        self.counts: dict[str, int] = dict.fromkeys(JOB_BOARD_COLUMNS.values(), 0)
+        self.pending_reward = 0.0
+        # scheduled job id -> (column, pending reward)
+        self._jobs: dict[int, tuple[str | None, float]] = {}
+
+    def _adjust(self, entry: tuple[str | None, float], sign: int) -> None:
+        """Add or remove a job from the counters."""
+        column, reward = entry
+        if column is not None:
+            self.counts[column] += sign
+        self.pending_reward += sign * reward
+
+    def apply(self, jobs: list[Job]) -> bool:
+        """Apply the jobs of a new snapshot, returns True if a counter moved."""
+        changed = False
+        current: dict[int, tuple[str | None, float]] = {}
+        for job in jobs:
+            current[job.scheduled_job_id] = (
+                JOB_BOARD_COLUMNS.get(job.state),
+                float(job.reward_amount or 0) if job.state in PENDING_JOB_STATES else 0.0,
+            )
+        for job_id, entry in current.items():
+            previous = self._jobs.get(job_id)
+            if previous == entry:
+                continue
+            if previous is not None:
+                self._adjust(previous, -1)
+            self._adjust(entry, 1)
+            changed = True
+        for job_id in self._jobs.keys() - current.keys():
+            self._adjust(self._jobs[job_id], -1)
+            changed = True
+        self._jobs = current
+        if not self._jobs:
+            # no drift from float adjustments once the board is empty
+            self.pending_reward = 0.0
+        return changed
+
+
+class RoosterAggregates:
+    """Family totals computed in a single pass over the latest snapshot."""
+
+    def __init__(self, rooster: RoosterMoney) -> None:
+        """Init the aggregates."""
+        self.rooster = rooster
+        self.family: dict[str, float] = {}
+        self.boards: dict[int, JobBoard] = {}
+        self.async_update()
+
+    def board(self, user_id: int) -> JobBoard:
+        """Return the job board of a child."""
+        if user_id not in self.boards:
+            self.boards[user_id] = JobBoard()
+        return self.boards[user_id]
+
+    @callback
+    def async_update(self) -> None:
+        """Recompute the totals from the current data."""
+        pocket_money = pots = pending_rewards = 0.0
+        awaiting_approval = 0
+        for child in self.rooster.children:
+            pocket_money += float(child.available_pocket_money or 0)
+            for pot in child.pots:
+                pots += float(pot.value or 0)
+            board = self.board(child.user_id)
+            board.apply(child.jobs)
+            pending_rewards += board.pending_reward
+            awaiting_approval += board.counts["awaiting_approval"]
+        self.family = {
+            "pocket_money": round(pocket_money, 2),
+            "pots": round(pots, 2),
+            "pending_rewards": round(pending_rewards, 2),
+            "awaiting_approval": awaiting_approval,
+        }
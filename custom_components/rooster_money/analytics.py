@@ -0,0 +1,226 @@
+"""Running spending and savings analytics for Rooster Money."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+import logging
+
+from pyroostermoney import RoosterMoney
+from pyroostermoney.child import ChildAccount
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import ALLOWANCE_TRANSACTION_TYPES, DOMAIN
+from .helpers import transaction_time
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+HISTORY_DAYS = 30
+
+
+class RollingWindow:
+    """A running total of transaction amounts inside a trailing time window."""
+
+    def __init__(self, days: int) -> None:
+        """Init the window."""
+        self.period = timedelta(days=days)
+        self.total = 0.0
+        self.by_type: dict[str, float] = {}
+        self._items: deque[tuple[datetime, float, str]] = deque()
+
+    def add(self, timestamp: datetime, amount: float, transaction_type: str) -> None:
+        """Add an amount to the window, items must be added in time order."""
+        self._items.append((timestamp, amount, transaction_type))
+        self.total += amount
+        self.by_type[transaction_type] = self.by_type.get(transaction_type, 0) + amount
+
+    def expire(self, now: datetime) -> None:
+        """Drop amounts that have moved out of the window."""
+        cutoff = now - self.period
+        while self._items and self._items[0][0] < cutoff:
+            _, amount, transaction_type = self._items.popleft()
+            self.total -= amount
+            # the type may already be gone if a sub-penny amount expired before
+            self.by_type[transaction_type] = (
+                self.by_type.get(transaction_type, 0) - amount
+            )
+            if abs(self.by_type[transaction_type]) < 0.005:
+                self.by_type.pop(transaction_type)
+
+
+class ChildAnalytics:
+    """Running aggregates for a single child."""
+
+    def __init__(self, since: datetime | None = None) -> None:
+        """Init the aggregates, since is the oldest transaction ever counted."""
+        self.since = since
+        # newest transaction counted and the ids counted at that time, older
+        # transactions are ignored even once they have expired from the history
+        self.latest: datetime | None = None
+        self._latest_ids: set = set()
+        self.spend_7d = RollingWindow(7)
+        self.spend_30d = RollingWindow(HISTORY_DAYS)
+        self.income_30d = RollingWindow(HISTORY_DAYS)
+        self.allowance_30d = RollingWindow(HISTORY_DAYS)
+        self._history: deque[tuple[datetime, int, float, str]] = deque()
+        self._seen: set = set()
+
+    def add(
+        self, timestamp: datetime, transaction_id, amount: float, transaction_type: str
+    ) -> bool:
+        """Add a single transaction, returns False if it was already counted."""
+        if transaction_id in self._seen:
+            return False
+        if self.latest is not None and (
+            timestamp < self.latest
+            or (timestamp == self.latest and transaction_id in self._latest_ids)
+        ):
+            # already expired, or out of order when the API corrects history
+            return False
+        if self.since is None or timestamp < self.since:
+            self.since = timestamp
+        if timestamp != self.latest:
+            self.latest = timestamp
+            self._latest_ids = set()
+        self._latest_ids.add(transaction_id)
+        self._seen.add(transaction_id)
+        self._history.append((timestamp, transaction_id, amount, transaction_type))
+        if amount < 0:
+            self.spend_7d.add(timestamp, -amount, transaction_type)
+            self.spend_30d.add(timestamp, -amount, transaction_type)
+        else:
+            self.income_30d.add(timestamp, amount, transaction_type)
+            if transaction_type in ALLOWANCE_TRANSACTION_TYPES:
+                self.allowance_30d.add(timestamp, amount, transaction_type)
+        return True
+
+    def expire(self, now: datetime) -> None:
+        """Move all windows forward to now."""
+        cutoff = now - timedelta(days=HISTORY_DAYS)
+        while self._history and self._history[0][0] < cutoff:
+            self._seen.discard(self._history.popleft()[1])
+        for window in (self.spend_7d, self.spend_30d, self.income_30d, self.allowance_30d):
+            window.expire(now)
+
+    @property
+    def average_weekly_allowance(self) -> float:
+        """Return the average allowance paid per week over the covered period."""
+        if self.since is None:
+            return 0.0
+        covered = min(
+            timedelta(days=HISTORY_DAYS),
+            max(timedelta(weeks=1), dt_util.utcnow() - self.since),
+        )
+        return self.allowance_30d.total / (covered / timedelta(weeks=1))
+
+    def as_dict(self) -> dict:
+        """Return the stored representation of the aggregates."""
+        return {
+            "since": self.since.isoformat() if self.since else None,
+            "latest": self.latest.isoformat() if self.latest else None,
+            "latest_ids": list(self._latest_ids),
+            "transactions": [
+                [timestamp.isoformat(), transaction_id, amount, transaction_type]
+                for timestamp, transaction_id, amount, transaction_type in self._history
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ChildAnalytics:
+        """Rebuild the aggregates from their stored representation."""
+        since = data.get("since")
+        analytics = cls(dt_util.parse_datetime(since) if since else None)
+        for timestamp, transaction_id, amount, transaction_type in data.get(
+            "transactions", []
+        ):
+            analytics.add(
+                dt_util.parse_datetime(timestamp),
+                transaction_id,
+                amount,
+                transaction_type,
+            )
+        if data.get("latest"):
+            analytics.latest = dt_util.parse_datetime(data["latest"])
+            analytics._latest_ids = set(data.get("latest_ids", []))
+        return analytics
+
+
+class RoosterAnalytics:
+    """Spending and savings analytics maintained from new transactions only."""
+
+    def __init__(
+        self, hass: HomeAssistant, rooster: RoosterMoney, entry_id: str
+    ) -> None:
+        """Init the analytics."""
+        self.hass = hass
+        self.rooster = rooster
+        self.children: dict[int, ChildAnalytics] = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.analytics")
+
+    async def async_load(self) -> None:
+        """Load stored aggregates and fold in the current data."""
+        data = await self._store.async_load() or {}
+        for user_id, child_data in data.get("children", {}).items():
+            self.children[int(user_id)] = ChildAnalytics.from_dict(child_data)
+        self.async_update()
+
+    def _data_to_save(self) -> dict:
+        """Return the data to store."""
+        return {
+            "children": {
+                str(user_id): analytics.as_dict()
+                for user_id, analytics in self.children.items()
+            }
+        }
+
+    def child(self, user_id: int) -> ChildAnalytics:
+        """Return the aggregates for a child."""
+        if user_id not in self.children:
+            self.children[user_id] = ChildAnalytics()
+        return self.children[user_id]
+
+    @callback
+    def async_update(self) -> None:
+        """Fold new transactions from the latest refresh into the aggregates."""
+        now = dt_util.utcnow()
+        changed = False
+        for child in self.rooster.children:
+            analytics = self.child(child.user_id)
+            transactions = []
+            for transaction in child.transactions:
+                timestamp = transaction_time(transaction)
+                if timestamp is not None and transaction.amount is not None:
+                    transactions.append((timestamp, transaction))
+            transactions.sort(key=lambda item: item[0])
+            for timestamp, transaction in transactions:
+                changed |= analytics.add(
+                    timestamp,
+                    transaction.transaction_id,
+                    float(transaction.amount),
+                    str(transaction.transaction_type),
+                )
+            analytics.expire(now)
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @staticmethod
+    def pot_progress(child: ChildAccount, pot_id: str) -> float | None:
+        """Return the progress of a pot toward its target as a percentage."""
+        for pot in child.pots:
+            if pot.pot_id == pot_id:
+                if not pot.target:
+                    return None
+                return round(float(pot.value) / float(pot.target) * 100, 1)
+        return None
+
+    def family_total(self, attr: str) -> float:
+        """Return the sum of a child aggregate across the family."""
+        total = 0.0
+        for analytics in self.children.values():
+            value = getattr(analytics, attr)
+            total += value.total if isinstance(value, RollingWindow) else value
+        return total
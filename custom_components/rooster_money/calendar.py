@@ -1,8 +1,9 @@
 """Defines a CalendarEntity for Rooster Money job's"""
 
+from bisect import bisect_left, bisect_right
 import logging
 from dateutil import rrule as RR
-from datetime import datetime, timezone, date, timedelta
+from datetime import datetime, time, timezone, date, timedelta
 from pyroostermoney import RoosterMoney
 
 from pyroostermoney.child import ChildAccount, Job
@@ -10,14 +11,20 @@ from pyroostermoney.enum import JobTime, JobScheduleTypes, Weekdays
 import pytz
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import UndefinedType
+from homeassistant.util import dt as dt_util
+from .entity_factory import PlatformEntities
 from .rooster_base import RoosterChildEntity
-from .const import DOMAIN
+from .const import DOMAIN, PAYOUT_HORIZON_DAYS
 
 _LOGGER = logging.getLogger(__name__)
 
+# pyroostermoney weekdays start at MONDAY = 1
+WEEKDAYS = [RR.MO, RR.TU, RR.WE, RR.TH, RR.FR, RR.SA, RR.SU]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -25,19 +32,26 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Rooster Money session."""
-    # Get a list of all children in account
-    entities = []
-    for child in hass.data[DOMAIN][config_entry.entry_id].rooster.children:
-        entities.append(
-            ChildJobCalendar(
-                coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                idx=None,
-                child_id=child.user_id,
-                entity_id="jobs",
-            )
-        )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator.entity_factory.async_add_platform(
+        Platform.CALENDAR,
+        PlatformEntities(async_add_entities, child=build_child_calendars),
+    )
+
 
-    async_add_entities(entities, True)
+def build_child_calendars(coordinator, child: ChildAccount) -> list[CalendarEntity]:
+    """Build the calendars of a child account."""
+    return [
+        ChildJobCalendar(
+            coordinator=coordinator, idx=None, child_id=child.user_id, entity_id="jobs"
+        ),
+        ChildPayoutCalendar(
+            coordinator=coordinator,
+            idx=None,
+            child_id=child.user_id,
+            entity_id="payouts",
+        ),
+    ]
 
 
 def build_calendar_event(
@@ -63,6 +77,35 @@ def build_calendar_event(
     return event
 
 
+def expand_job_events(
+    jobs: list[Job], start: datetime, end: datetime
+) -> list[CalendarEvent]:
+    """Flattens repeating jobs into an event per occurrence between two dates."""
+    events: list[CalendarEvent] = []
+    for job in jobs:
+        _LOGGER.debug("Convert Job %s into CalendarEvent type", job.master_job_id)
+        # we ignore anytime events and unknown events as these have no set cycle
+        if job.schedule_type is not JobScheduleTypes.REPEATING:
+            continue
+        for weekday in job.weekdays or []:
+            # Create an event for each weekday
+            for recurrance in RR.rrule(
+                RR.WEEKLY,
+                byweekday=WEEKDAYS[int(weekday) - 1],
+                dtstart=start,
+                until=end,
+            ):
+                events.append(
+                    build_calendar_event(
+                        title=job.title,
+                        due_date=recurrance,
+                        time_of_day=job.time_of_day,
+                        id=job.master_job_id,
+                    )
+                )
+    return events
+
+
 class ChildJobCalendar(CalendarEntity, RoosterChildEntity):
     """A job calendar for a child"""
 
@@ -101,33 +144,158 @@ class ChildJobCalendar(CalendarEntity, RoosterChildEntity):
         # add 2 weeks of padding.
         job_start = start_date - timedelta(weeks=2)
         job_end = end_date + timedelta(weeks=2)
-        events: list[CalendarEvent] = []
-        for job in self.coordinator.rooster.master_jobs.get_child_master_job_list(
+        jobs = self.coordinator.rooster.master_jobs.get_child_master_job_list(
             self._child
-        ):
-            _LOGGER.debug("Convert Job %s into CalendarEvent type", job.master_job_id)
-            # need to flatten the event(s)
-            # we also ignore anytime events and unknown events as these have no set cycle
-            if job.schedule_type is JobScheduleTypes.REPEATING:
-                for weekday in job.weekdays:
-                    # Create an event for each weekday
-                    recurrance_range = RR.rrule(
-                        RR.WEEKLY,
-                        byweekday=int(weekday),
-                        dtstart=job_start,
-                        until=job_end,
-                    )
-                    for recurrance in recurrance_range:
-                        events.append(
-                            build_calendar_event(
-                                title=job.title,
-                                due_date=recurrance,
-                                time_of_day=job.time_of_day,
-                                id=job.master_job_id,
-                            )
-                        )
-        return events
+        )
+        repeating = [
+            job for job in jobs if job.schedule_type is JobScheduleTypes.REPEATING
+        ]
+        # one occurrence per weekday of every repeating job in each week of the range
+        weeks = (job_end - job_start) // timedelta(weeks=1) + 1
+        events = await self.coordinator.offload.async_run(
+            ("job_events", self._child_id),
+            (
+                job_start,
+                job_end,
+                [
+                    (job.master_job_id, job.title, job.time_of_day, job.weekdays)
+                    for job in repeating
+                ],
+            ),
+            weeks * sum(len(job.weekdays or []) for job in repeating),
+            expand_job_events,
+            repeating,
+            job_start,
+            job_end,
+        )
+        return list(events)
 
     async def async_set_job_completed(self, job_id: int) -> None:
         """Sets a job as complete."""
         return None
+
+
+def payout_rule(frequency: str, day, start: date, until: date) -> RR.rrule | None:
+    """Convert a payout frequency and day into a recurrence rule.
+
+    Returns None for frequencies that cannot be projected.
+    """
+    if isinstance(day, str) and day.upper() in Weekdays.__members__:
+        day = Weekdays[day.upper()]
+    weekday = WEEKDAYS[int(day) - 1] if isinstance(day, Weekdays) else None
+    frequency = str(frequency).upper()
+    if frequency == "DAILY":
+        return RR.rrule(RR.DAILY, dtstart=start, until=until)
+    if frequency == "MONTHLY":
+        if weekday is not None:
+            return RR.rrule(RR.MONTHLY, byweekday=weekday(1), dtstart=start, until=until)
+        monthday = int(day) if str(day).isdigit() else 1
+        return RR.rrule(RR.MONTHLY, bymonthday=monthday, dtstart=start, until=until)
+    if frequency == "WEEKLY":
+        return RR.rrule(RR.WEEKLY, byweekday=weekday or RR.MO, dtstart=start, until=until)
+    return None
+
+
+class ChildPayoutCalendar(CalendarEntity, RoosterChildEntity):
+    """Upcoming allowance and standing order payouts for a child."""
+
+    def __init__(self, coordinator, idx, child_id: int, entity_id: str) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator, idx, child_id, entity_id)
+        self._signature = None
+        self._starts: list[date] = []
+        self._events: list[CalendarEvent] = []
+
+    @property
+    def name(self) -> str | UndefinedType | None:
+        """Return the name of the calendar."""
+        return "Payouts"
+
+    def _payout_signature(self) -> tuple:
+        """Return everything the payout index depends on."""
+        child = self._child
+        return (
+            dt_util.now().date(),
+            child.allowance,
+            child.allowance_amount,
+            child.allowance_day,
+            child.available_pocket_money,
+            tuple(
+                (regular.regular_id, regular.amount, regular.day, regular.frequency)
+                for regular in child.standing_orders
+                if regular.active
+            ),
+        )
+
+    def _build_index(self) -> None:
+        """Materialises upcoming payouts, only when the inputs have changed."""
+        signature = self._payout_signature()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        child = self._child
+        start = signature[0]
+        until = start + timedelta(days=PAYOUT_HORIZON_DAYS)
+        payouts: list[tuple[date, str, str, float]] = []
+        if child.allowance and child.allowance_amount:
+            for occurrence in payout_rule(
+                "WEEKLY", child.allowance_day, start, until
+            ):
+                payouts.append(
+                    (occurrence.date(), "allowance", "Pocket Money", float(child.allowance_amount))
+                )
+        for regular in child.standing_orders:
+            if not regular.active:
+                continue
+            rule = payout_rule(regular.frequency, regular.day, start, until)
+            if rule is None:
+                _LOGGER.warning(
+                    "Skipping standing order %s, unsupported frequency %s",
+                    regular.regular_id,
+                    regular.frequency,
+                )
+                continue
+            for occurrence in rule:
+                payouts.append(
+                    (occurrence.date(), str(regular.regular_id), regular.title, float(regular.amount))
+                )
+        payouts.sort(key=lambda payout: payout[0])
+
+        currency = str(child.currency).upper()
+        balance = float(child.available_pocket_money or 0)
+        self._starts = []
+        self._events = []
+        for day, payout_id, title, amount in payouts:
+            balance += amount
+            self._starts.append(day)
+            self._events.append(
+                CalendarEvent(
+                    start=day,
+                    end=day + timedelta(days=1),
+                    summary=f"{title} {amount:.2f} {currency}",
+                    description=f"Projected balance {balance:.2f} {currency}",
+                    uid=f"{payout_id}_{day.isoformat()}",
+                )
+            )
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming event."""
+        self._build_index()
+        return self._events[0] if self._events else None
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return payouts between a start and end date from the index."""
+        self._build_index()
+        # an all-day payout overlaps the range unless the range ends at its midnight
+        last_day = end_date.date()
+        if end_date.time() == time.min:
+            last_day -= timedelta(days=1)
+        first = bisect_left(self._starts, start_date.date())
+        last = bisect_right(self._starts, last_day)
+        return self._events[first:last]
@@ -0,0 +1,220 @@
+"""Record and replay Rooster Money API traffic."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+import contextlib
+import copy
+from datetime import datetime
+import json
+import logging
+import os
+import time
+from typing import Any
+
+import aiohttp
+from pyroostermoney import RoosterMoney
+from pyroostermoney.master_jobs import MasterJobs
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CASSETTE_MAX_BYTES, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACT_KEYS = {
+    "Authorization",
+    "access_token",
+    "accountNumber",
+    "email",
+    "encryptedCardNumber",
+    "encryptedExpiryMonth",
+    "encryptedExpiryYear",
+    "encryptedSecurityCode",
+    "expDate",
+    "firstName",
+    "holderName",
+    "id_token",
+    "maskedPan",
+    "password",
+    "pin",
+    "refresh_token",
+    "securitytoken",
+    "sortCode",
+    "surname",
+    "username",
+}
+
+
+def cassette_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the cassette the traffic of an entry is recorded to."""
+    return hass.config.path(f"{DOMAIN}_cassettes", f"{entry_id}.jsonl")
+
+
+def remove_cassettes(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the recorded cassettes of an entry, blocking."""
+    path = cassette_path(hass, entry_id)
+    for filename in (path, f"{path}.1"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(filename)
+
+
+class CassetteRecorder:
+    """Records redacted request/response pairs to a JSON lines cassette.
+
+    Once the cassette reaches max_bytes it is moved to a .1 backup, replacing
+    the previous one, so recording never uses more than twice max_bytes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rooster: RoosterMoney,
+        path: str,
+        max_bytes: int = CASSETTE_MAX_BYTES,
+    ) -> None:
+        """Init the recorder and attach it to the session."""
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = False
+        self.recorded = 0
+        self._buffer: list[str] = []
+        self._lock = asyncio.Lock()
+        send_request = rooster._send_request  # pylint: disable=protected-access
+
+        async def recording_send_request(url, body=None, auth=None, method="GET"):
+            if not self.enabled:
+                return await send_request(url, body, auth, method)
+            started = time.monotonic()
+            entry: dict[str, Any] = {
+                "time": dt_util.utcnow().isoformat(),
+                "method": method.upper(),
+                "url": url,
+                "request": async_redact_data(body, REDACT_KEYS) if body else None,
+            }
+            try:
+                output = await send_request(url, body, auth, method)
+            except Exception as err:
+                entry["error"] = type(err).__name__
+                entry["message"] = str(err)
+                raise
+            else:
+                entry["status"] = output.get("status")
+                entry["response"] = async_redact_data(output.get("response"), REDACT_KEYS)
+                return output
+            finally:
+                entry["duration"] = round(time.monotonic() - started, 4)
+                self._buffer.append(json.dumps(entry, default=str))
+                self.recorded += 1
+                self.hass.async_create_task(self.async_flush())
+
+        rooster._send_request = recording_send_request  # pylint: disable=protected-access
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the cassette, rotating it once it is full."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            if os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, f"{self.path}.1")
+        with open(self.path, "a", encoding="utf-8") as cassette:
+            cassette.writelines(f"{line}\n" for line in lines)
+
+    async def async_flush(self) -> None:
+        """Write buffered entries to disk in order."""
+        async with self._lock:
+            lines, self._buffer = self._buffer, []
+            if lines:
+                await self.hass.async_add_executor_job(self._write, lines)
+
+    async def async_set_enabled(self, enabled: bool) -> None:
+        """Start or stop recording."""
+        self.enabled = enabled
+        _LOGGER.info(
+            "%s recording Rooster Money traffic to %s",
+            "Started" if enabled else "Stopped",
+            self.path,
+        )
+        if not enabled:
+            await self.async_flush()
+
+
+class RoosterReplay(RoosterMoney):
+    """A RoosterMoney session served from a recorded cassette.
+
+    Responses are returned in recorded order per method and URL, the last one is
+    repeated once a URL runs out so refreshes can be replayed indefinitely. With
+    accept_writes, writes that were never recorded succeed with an empty response.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Init the replay session."""
+        super().__init__(*args, **kwargs)
+        self.speed = 1.0
+        self.accept_writes = False
+        self._responses: dict[tuple[str, str], deque[dict]] = defaultdict(deque)
+
+    def load_cassette(self, path: str) -> None:
+        """Load a cassette from disk, blocking."""
+        with open(path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses[(entry["method"], entry["url"])].append(entry)
+
+    @classmethod
+    async def create_from_cassette(
+        cls,
+        hass: HomeAssistant,
+        path: str,
+        speed: float = 1.0,
+        remove_card_information: bool = True,
+        accept_writes: bool = False,
+    ) -> RoosterReplay:
+        """Create a session that replays a cassette, speed 0 disables delays.
+
+        Mirrors RoosterMoney.create, the cassette has to be loaded before login.
+        """
+        self = cls(remove_card_information=remove_card_information)
+        self.speed = speed
+        self.accept_writes = accept_writes
+        await hass.async_add_executor_job(self.load_cassette, path)
+        await self._session_start("replay", "replay")
+        await self.get_family_account()
+        self.family_id = self.family_account.family_id
+        self.family_balance = self.family_account.balance
+        self.master_jobs = MasterJobs(self)
+        await self.update()
+        self._init = False
+        return self
+
+    async def _session_start(self, username, password):
+        """Start a fake session, login is never part of a cassette."""
+        self._session = {
+            "access_token": "replay",
+            "refresh_token": None,
+            "token_type": "Bearer",
+            "expiry_time": datetime.max,
+            "security_code": "",
+        }
+        self._logged_in = True
+        return True
+
+    async def _send_request(self, url, body: dict = None, auth=None, method="GET"):
+        """Serve a request from the cassette."""
+        responses = self._responses.get((method.upper(), url))
+        if not responses and self.accept_writes and method.upper() != "GET":
+            return {"status": 200, "response": {}}
+        if not responses:
+            raise aiohttp.ClientError(f"No recorded response for {method} {url}")
+        entry = responses.popleft() if len(responses) > 1 else responses[0]
+        if self.speed:
+            await asyncio.sleep(entry.get("duration", 0) / self.speed)
+        if entry.get("error") == "PermissionError":
+            raise PermissionError(entry.get("message"))
+        if "error" in entry:
+            raise aiohttp.ClientError(entry.get("message"))
+        # pyroostermoney mutates responses while parsing them
+        return {"status": entry.get("status"), "response": copy.deepcopy(entry.get("response"))}
@@ -9,11 +9,13 @@ from pyroostermoney.exceptions import InvalidAuthError
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import DOMAIN, JOB_HISTORY_RETENTION_DAYS
+from .push import webhook_url
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +25,12 @@ CONFIG_SCHEMA = vol.Schema(
         vol.Required("password"): str,
         vol.Required("exclude_card_pin", default=True): bool,
         vol.Optional("update_interval", default=60): int,
+        vol.Optional("daily_request_budget", default=0): int,
+        vol.Optional("queue_failed_writes", default=False): bool,
+        vol.Optional("hedge_requests", default=False): bool,
+        vol.Optional("job_history_days", default=JOB_HISTORY_RETENTION_DAYS): vol.All(
+            int, vol.Range(min=0)
+        ),
     }
 )
 
@@ -70,10 +78,34 @@ class OptionsFlow(config_entries.OptionsFlow):
                 vol.Optional(
                     "update_interval", default=entry.options["update_interval"]
                 ): int,
+                vol.Optional(
+                    "daily_request_budget",
+                    default=entry.options.get("daily_request_budget", 0),
+                ): int,
+                vol.Optional(
+                    "queue_failed_writes",
+                    default=entry.options.get("queue_failed_writes", False),
+                ): bool,
+                vol.Optional(
+                    "hedge_requests",
+                    default=entry.options.get("hedge_requests", False),
+                ): bool,
+                vol.Optional(
+                    "job_history_days",
+                    default=entry.options.get(
+                        "job_history_days", JOB_HISTORY_RETENTION_DAYS
+                    ),
+                ): vol.All(int, vol.Range(min=0)),
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            description_placeholders={
+                "webhook_url": webhook_url(self.hass, entry.data[CONF_WEBHOOK_ID])
+            },
+        )
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -40,6 +40,107 @@ FAMILY_ACCOUNT_ATTR_MAP = {
     },
 }
 
+DEFAULT_UPDATE_INTERVAL = 60
+TARGETED_REFRESH_COOLDOWN = 2
+TARGETED_REFRESH_RESOURCES = {
+    "transaction": "get_spend_history",
+    "job": "get_current_jobs",
+    "pot": "get_pocket_money",
+    "card": "get_card_details",
+}
+
+REFRESH_TIMEOUT = 50
+REQUEST_TIMEOUT = 10
+REQUEST_RETRIES = 2
+REQUEST_RETRY_BACKOFF = 0.5
+HEDGE_MIN_SAMPLES = 20
+
+RATE_LIMIT_CAPACITY = 60
+RATE_LIMIT_PER_SECOND = 1.0
+RATE_LIMIT_WRITE_RESERVE = 5
+RATE_LIMIT_BUDGET_LOW = 0.1
+
+WRITE_COALESCE_WINDOW = 1.0
+OUTBOX_BACKOFF_MIN = 30
+OUTBOX_BACKOFF_MAX = 3600
+OUTBOX_MAX_ATTEMPTS = 10
+
+CASSETTE_MAX_BYTES = 20 * 1024 * 1024
+
+IMAGE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+IMAGE_CACHE_MAX_AGE = 31536000
+IMAGE_SIGNATURE_LIFETIME = 7 * 24 * 3600
+
+PAYOUT_HORIZON_DAYS = 366
+
+# jobs, transactions or calendar occurrences above which work leaves the event loop
+OFFLOAD_MIN_ITEMS = 250
+
+JOB_HISTORY_RETENTION_DAYS = 365
+JOB_HISTORY_COMPACT_INTERVAL = 86400
+JOB_HISTORY_EXPORT_CHUNK = 500
+
+ALLOWANCE_TRANSACTION_TYPES = {"POCKET_MONEY", "ALLOWANCE"}
+
+CHILD_ANALYTICS_ATTR_MAP = {
+    "spend_7d": {
+        "name": "Spend Last 7 Days",
+        "icon": "mdi:cash-minus",
+    },
+    "spend_30d": {
+        "name": "Spend Last 30 Days",
+        "icon": "mdi:cash-minus",
+    },
+    "income_30d": {
+        "name": "Income Last 30 Days",
+        "icon": "mdi:cash-plus",
+    },
+    "average_weekly_allowance": {
+        "name": "Average Weekly Allowance",
+        "icon": "mdi:cash-sync",
+    },
+}
+
+CHILD_JOB_BOARD_ATTR_MAP = {
+    "todo": {"name": "Jobs To Do", "icon": "mdi:clipboard-list-outline"},
+    "awaiting_approval": {
+        "name": "Jobs Awaiting Approval",
+        "icon": "mdi:clipboard-alert",
+    },
+    "approved": {"name": "Jobs Approved", "icon": "mdi:clipboard-check"},
+    "expired": {"name": "Jobs Expired", "icon": "mdi:clipboard-remove"},
+    "pending_reward": {
+        "name": "Pending Job Rewards",
+        "icon": "mdi:clipboard-text-clock",
+        "monetary": True,
+    },
+}
+
+FAMILY_ANALYTICS_ATTR_MAP = {
+    "spend_7d": {"name": "Family Spend Last 7 Days", "icon": "mdi:cash-minus"},
+    "spend_30d": {"name": "Family Spend Last 30 Days", "icon": "mdi:cash-minus"},
+    "income_30d": {"name": "Family Income Last 30 Days", "icon": "mdi:cash-plus"},
+}
+
+FAMILY_AGGREGATE_ATTR_MAP = {
+    "pocket_money": {
+        "name": "Total Pocket Money",
+        "icon": "mdi:piggy-bank-outline",
+        "monetary": True,
+    },
+    "pots": {"name": "Total In Pots", "icon": "mdi:pot-steam", "monetary": True},
+    "pending_rewards": {
+        "name": "Total Pending Job Rewards",
+        "icon": "mdi:clipboard-text-clock",
+        "monetary": True,
+    },
+    "awaiting_approval": {
+        "name": "Jobs Awaiting Approval",
+        "icon": "mdi:clipboard-alert",
+        "monetary": False,
+    },
+}
+
 ENTITY_SERVICES = {
     "create_standing_order": {
         "schema": {
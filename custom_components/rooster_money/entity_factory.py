@@ -0,0 +1,101 @@
+"""Builds Rooster Money entities for every platform from one snapshot pass."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING
+
+from pyroostermoney.child import ChildAccount, Pot
+from pyroostermoney.family_account import FamilyAccount
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+if TYPE_CHECKING:
+    from .update_coordinator import RoosterCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PlatformEntities:
+    """The entity builders of a platform."""
+
+    async_add_entities: AddEntitiesCallback
+    family: Callable[[RoosterCoordinator, FamilyAccount], list[Entity]] | None = None
+    child: Callable[[RoosterCoordinator, ChildAccount], list[Entity]] | None = None
+    pot: Callable[[RoosterCoordinator, ChildAccount, Pot], list[Entity]] | None = None
+
+
+class RoosterEntityFactory:
+    """Adds entities for new children and pots and retires stale ones."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: RoosterCoordinator) -> None:
+        """Init the factory."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._platforms: dict[Platform, PlatformEntities] = {}
+        # platform -> snapshot key -> entities built for it
+        self._entities: dict[Platform, dict[tuple, list[Entity]]] = {}
+        self._snapshot: dict[tuple, tuple] | None = None
+
+    def _build_snapshot(self) -> dict[tuple, tuple]:
+        """One pass over the accounts, keyed by what entities are built from."""
+        rooster = self.coordinator.rooster
+        snapshot: dict[tuple, tuple] = {("family",): (rooster.family_account,)}
+        for child in rooster.children:
+            snapshot[("child", child.user_id)] = (child,)
+            for pot in child.pots:
+                snapshot[("pot", child.user_id, pot.pot_id)] = (child, pot)
+        return snapshot
+
+    @callback
+    def async_add_platform(
+        self, platform: Platform, builders: PlatformEntities
+    ) -> None:
+        """Register a platform and add its entities for the current snapshot."""
+        if not self._platforms:
+            self.coordinator.config_entry.async_on_unload(
+                self.coordinator.async_add_listener(self.async_sync)
+            )
+        self._platforms[platform] = builders
+        self._entities[platform] = {}
+        if self._snapshot is None:
+            self._snapshot = self._build_snapshot()
+        self._async_sync_platform(platform, self._snapshot)
+
+    @callback
+    def async_sync(self) -> None:
+        """Bring the entities of every platform in line with the latest snapshot."""
+        self._snapshot = self._build_snapshot()
+        for platform in self._platforms:
+            self._async_sync_platform(platform, self._snapshot)
+
+    def _async_sync_platform(
+        self, platform: Platform, snapshot: dict[tuple, tuple]
+    ) -> None:
+        """Add and retire the entities of a single platform."""
+        builders = self._platforms[platform]
+        known = self._entities[platform]
+        new_entities: list[Entity] = []
+        for key, args in snapshot.items():
+            if key in known:
+                continue
+            builder = getattr(builders, key[0])
+            known[key] = builder(self.coordinator, *args) if builder else []
+            new_entities.extend(known[key])
+        if new_entities:
+            builders.async_add_entities(new_entities)
+
+        registry = er.async_get(self.hass)
+        for key in known.keys() - snapshot.keys():
+            _LOGGER.debug("Retiring %s entities for %s", platform, key)
+            for entity in known.pop(key):
+                if entity.registry_entry is not None:
+                    registry.async_remove(entity.entity_id)
+                elif entity.hass is not None:
+                    self.hass.async_create_task(entity.async_remove())
@@ -1,9 +1,106 @@
 """rooster_money helpers."""
 
 import json
+from pyroostermoney.child import ChildAccount
+from pyroostermoney.family_account import FamilyAccount
 from pyroostermoney.child.jobs import Job, JobScheduleTypes, JobState, JobTime
+from pyroostermoney.child.transaction import Transaction
 from datetime import datetime
 
+from homeassistant.util import dt as dt_util
+
+
+def transaction_time(transaction: Transaction) -> datetime | None:
+    """Return the UTC timestamp of a transaction."""
+    timestamp = transaction.transaction_timestamp
+    if isinstance(timestamp, str):
+        timestamp = dt_util.parse_datetime(timestamp)
+    if timestamp is None:
+        return None
+    return dt_util.as_utc(timestamp)
+
+
+def child_overview(child: ChildAccount) -> dict:
+    """Return a snapshot of a child account built from cached data."""
+    return {
+        "user_id": child.user_id,
+        "first_name": child.first_name,
+        "currency": str(child.currency).upper(),
+        "balance": child.available_pocket_money,
+        "allowance": {
+            "active": child.allowance,
+            "amount": child.allowance_amount,
+            "day": str(child.allowance_day.name) if child.allowance_day else None,
+            "last_paid": child.allowance_last_paid,
+        },
+        "card": None
+        if child.card is None
+        else {
+            "status": child.card.status,
+            "total_spend": child.card.total_spend,
+            "spend_limit": child.card.spend_limit,
+        },
+        "pots": [
+            {
+                "id": pot.pot_id,
+                "name": pot.name,
+                "value": pot.value,
+                "target": pot.target,
+                "enabled": pot.enabled,
+            }
+            for pot in child.pots
+        ],
+        "jobs": [
+            {
+                "id": job.scheduled_job_id,
+                "title": job.title,
+                "state": str(job.state),
+                "reward_amount": job.reward_amount,
+                "due_date": job.due_date.isoformat() if job.due_date else None,
+            }
+            for job in child.jobs
+        ],
+        "regulars": [
+            {
+                "id": regular.regular_id,
+                "amount": regular.amount,
+                "title": regular.title,
+                "tag": regular.tag,
+                "frequency": regular.frequency,
+                "day": regular.day,
+                "active": regular.active,
+            }
+            for regular in child.standing_orders
+        ],
+    }
+
+
+def family_transaction_attributes(transactions: list[dict] | None) -> dict:
+    """Return the attributes of the family transaction sensor."""
+    transactions = transactions or []
+    latest = transactions[0] if transactions else {}
+    return {
+        # a copy, so the state does not share the list pyroostermoney owns
+        "month_transactions": [dict(transaction) for transaction in transactions],
+        "type": latest.get("type"),
+        "reason": latest.get("reason"),
+    }
+
+
+def encode_jobs(jobs: list[Job]) -> str:
+    """Return jobs as a JSON array."""
+    return json.dumps(jobs, cls=JobEncoder)
+
+
+def family_overview(account: FamilyAccount, children: list[ChildAccount]) -> dict:
+    """Return a snapshot of a family built from cached data."""
+    return {
+        "account_number": account.account_number,
+        "currency": str(account.currency).upper(),
+        "balance": account.balance,
+        "children": [child_overview(child) for child in children],
+    }
+
 
 class JobEncoder(json.JSONEncoder):
     """JSON Encoder for Job types."""
@@ -0,0 +1,207 @@
+"""Local cache for Rooster Money pictures."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import contextlib
+from datetime import timedelta
+import hashlib
+from http import HTTPStatus
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import time
+
+from aiohttp import ClientError, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.auth import STORAGE_KEY, async_sign_path
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    IMAGE_CACHE_MAX_AGE,
+    IMAGE_CACHE_MAX_BYTES,
+    IMAGE_SIGNATURE_LIFETIME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+IMAGE_URL = f"/api/{DOMAIN}/image/{{entry_id}}/{{filename}}"
+FILENAME_RE = re.compile(r"^[0-9a-f]{32}\.[a-z0-9]+$")
+
+
+def image_dir(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the directory holding the cached images of an entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}_images", entry_id)
+
+
+def remove_image_dir(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the cached images of an entry, blocking."""
+    shutil.rmtree(image_dir(hass, entry_id), ignore_errors=True)
+
+
+class RoosterImageCache:
+    """Downloads pictures once and serves them from disk with bounded size."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, on_fetched: Callable[[], None]
+    ) -> None:
+        """Init the cache."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.path = image_dir(hass, entry_id)
+        self._on_fetched = on_fetched
+        # remote url -> {"filename", "size", "accessed"}
+        self._index: dict[str, dict] = {}
+        self._fetching: set[str] = set()
+        # filename -> (renew after, signed url)
+        self._signed: dict[str, tuple[float, str]] = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.images")
+
+    async def async_load(self) -> None:
+        """Load the index of cached images."""
+        self._index = (await self._store.async_load() or {}).get("images", {})
+
+    def _data_to_save(self) -> dict:
+        """Return the data to store."""
+        return {"images": self._index}
+
+    @callback
+    def async_get_url(self, remote: str | None) -> str | None:
+        """Return the local url of a picture, fetching it in the background."""
+        if not remote:
+            return remote
+        if (cached := self._index.get(remote)) is not None:
+            cached["accessed"] = dt_util.utcnow().timestamp()
+            return self._signed_url(cached["filename"])
+        if remote not in self._fetching:
+            self._fetching.add(remote)
+            self.hass.async_create_task(self._async_fetch(remote))
+        return remote
+
+    @callback
+    def _signed_url(self, filename: str) -> str:
+        """Return a signed url of a cached picture.
+
+        Signatures are reused for half their lifetime, so the entity picture
+        does not change on every state write.
+        """
+        signed = self._signed.get(filename)
+        if signed is None or signed[0] < time.time():
+            url = async_sign_path(
+                self.hass,
+                IMAGE_URL.format(entry_id=self.entry_id, filename=filename),
+                timedelta(seconds=IMAGE_SIGNATURE_LIFETIME),
+                # not the user whose websocket call triggered the state write
+                refresh_token_id=self.hass.data[STORAGE_KEY],
+            )
+            signed = (time.time() + IMAGE_SIGNATURE_LIFETIME / 2, url)
+            self._signed[filename] = signed
+        return signed[1]
+
+    def _write(self, filename: str, content: bytes) -> None:
+        """Write an image to disk."""
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, filename), "wb") as image:
+            image.write(content)
+
+    def _remove(self, filenames: list[str]) -> None:
+        """Remove evicted images from disk."""
+        in_use = {cached["filename"] for cached in self._index.values()}
+        for filename in filenames:
+            if filename not in in_use:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(self.path, filename))
+
+    async def _async_fetch(self, remote: str) -> None:
+        """Download a picture into the cache."""
+        try:
+            await self._async_download(remote)
+        finally:
+            self._fetching.discard(remote)
+
+    async def _async_download(self, remote: str) -> None:
+        """Download a picture and add it to the index."""
+        try:
+            session = async_get_clientsession(self.hass)
+            async with session.get(remote) as response:
+                response.raise_for_status()
+                content = await response.read()
+                content_type = response.content_type
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.debug("Unable to fetch %s: %s", remote, err)
+            return
+
+        extension = (mimetypes.guess_extension(content_type) or ".img").lstrip(".")
+        filename = f"{hashlib.sha256(content).hexdigest()[:32]}.{extension}"
+        await self.hass.async_add_executor_job(self._write, filename, content)
+        self._index[remote] = {
+            "filename": filename,
+            "size": len(content),
+            "accessed": dt_util.utcnow().timestamp(),
+        }
+        await self._async_evict()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._on_fetched()
+
+    async def _async_evict(self) -> None:
+        """Drop the least recently used images until the cache fits."""
+        total = sum(cached["size"] for cached in self._index.values())
+        evicted = []
+        for remote, cached in sorted(
+            self._index.items(), key=lambda item: item[1]["accessed"]
+        ):
+            if total <= IMAGE_CACHE_MAX_BYTES:
+                break
+            total -= cached["size"]
+            evicted.append(cached["filename"])
+            self._signed.pop(cached["filename"], None)
+            self._index.pop(remote)
+        if evicted:
+            await self.hass.async_add_executor_job(self._remove, evicted)
+
+
+class RoosterImageView(HomeAssistantView):
+    """Serves cached pictures to authenticated users and signed urls.
+
+    The content hash in the url makes them immutable.
+    """
+
+    url = IMAGE_URL
+    name = f"api:{DOMAIN}:image"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init the view."""
+        self.hass = hass
+
+    def _read(self, entry_id: str, filename: str) -> bytes | None:
+        """Read an image from disk."""
+        try:
+            with open(os.path.join(image_dir(self.hass, entry_id), filename), "rb") as image:
+                return image.read()
+        except FileNotFoundError:
+            return None
+
+    async def get(
+        self, request: web.Request, entry_id: str, filename: str
+    ) -> web.Response:
+        """Serve a cached picture."""
+        if not FILENAME_RE.match(filename) or not re.match(r"^[0-9a-zA-Z]+$", entry_id):
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        content = await self.hass.async_add_executor_job(self._read, entry_id, filename)
+        if content is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        return web.Response(
+            body=content,
+            content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            headers={
+                "Cache-Control": f"private, max-age={IMAGE_CACHE_MAX_AGE}, immutable"
+            },
+        )
@@ -0,0 +1,253 @@
+"""Append-only history of finished Rooster Money jobs."""
+from __future__ import annotations
+
+import asyncio
+import csv
+from datetime import datetime, timedelta
+import itertools
+import json
+import logging
+import os
+import shutil
+
+from pyroostermoney import RoosterMoney
+from pyroostermoney.enum import JobState
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, JOB_HISTORY_COMPACT_INTERVAL, JOB_HISTORY_EXPORT_CHUNK
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# jobs that can no longer change state within their allowance period
+LOGGED_JOB_STATES = {JobState.APPROVED, JobState.NOT_DONE, JobState.SKIPPED}
+
+# a logged row holds every column but child_id, which is the name of its log file
+EXPORT_COLUMNS = [
+    "logged",
+    "child_id",
+    "job_id",
+    "master_job_id",
+    "title",
+    "state",
+    "reward",
+    "currency",
+    "due_date",
+]
+
+
+def history_dir(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the directory holding the job logs of an entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}_job_history", entry_id)
+
+
+def export_dir(hass: HomeAssistant) -> str:
+    """Return the directory the job history is exported to."""
+    return hass.config.path(f"{DOMAIN}_exports")
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the job logs of an entry and the jobs it has logged."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, history_dir(hass, entry_id), True
+    )
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.job_history").async_remove()
+
+
+class RoosterJobHistory:
+    """Logs every job once it is finished, so it outlives its allowance period.
+
+    Each child has a JSON lines log that is only ever appended to, rows older
+    than the retention are dropped by rewriting the log at most once a day.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rooster: RoosterMoney,
+        entry_id: str,
+        retention_days: int = 0,
+    ) -> None:
+        """Init the history, a retention of 0 keeps every row."""
+        self.hass = hass
+        self.rooster = rooster
+        self.entry_id = entry_id
+        self.path = history_dir(hass, entry_id)
+        self.retention = (
+            timedelta(days=retention_days) if retention_days > 0 else None
+        )
+        # user id -> scheduled job ids of the current period that are logged
+        self._logged: dict[int, set[int]] = {}
+        self._compacted: datetime | None = None
+        self._buffer: dict[int, list[str]] = {}
+        self._lock = asyncio.Lock()
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.job_history")
+
+    async def async_load(self) -> None:
+        """Load the logged jobs of the current period and log new ones."""
+        data = await self._store.async_load() or {}
+        self._logged = {
+            int(user_id): set(job_ids)
+            for user_id, job_ids in data.get("logged", {}).items()
+        }
+        if data.get("compacted"):
+            self._compacted = dt_util.parse_datetime(data["compacted"])
+        self.async_update()
+
+    def _data_to_save(self) -> dict:
+        """Return the data to store."""
+        return {
+            "logged": {
+                str(user_id): sorted(job_ids)
+                for user_id, job_ids in self._logged.items()
+            },
+            "compacted": self._compacted.isoformat() if self._compacted else None,
+        }
+
+    def _log_path(self, user_id: int) -> str:
+        """Return the log of a child."""
+        return os.path.join(self.path, f"{user_id}.jsonl")
+
+    def _compact_due(self, now: datetime) -> bool:
+        """Return True if rows may have moved out of the retention."""
+        return self.retention is not None and (
+            self._compacted is None
+            or now - self._compacted > timedelta(seconds=JOB_HISTORY_COMPACT_INTERVAL)
+        )
+
+    @callback
+    def async_update(self) -> None:
+        """Log the jobs that finished since the last refresh."""
+        now = dt_util.utcnow()
+        changed = False
+        children = {child.user_id: child for child in self.rooster.children}
+        for user_id in self._logged.keys() - children.keys():
+            self._logged.pop(user_id)
+            changed = True
+        for user_id, child in children.items():
+            logged = self._logged.setdefault(user_id, set())
+            current = set()
+            for job in child.jobs:
+                current.add(job.scheduled_job_id)
+                if job.state not in LOGGED_JOB_STATES or job.scheduled_job_id in logged:
+                    continue
+                logged.add(job.scheduled_job_id)
+                self._buffer.setdefault(user_id, []).append(
+                    json.dumps(
+                        [
+                            now.isoformat(),
+                            job.scheduled_job_id,
+                            job.master_job_id,
+                            job.title,
+                            str(job.state),
+                            float(job.final_reward_amount or job.reward_amount or 0),
+                            job.currency,
+                            job.due_date.date().isoformat() if job.due_date else None,
+                        ]
+                    )
+                )
+                changed = True
+            # jobs of a past period are never returned again
+            if logged - current:
+                logged &= current
+                changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        if self._buffer or self._compact_due(now):
+            self.hass.async_create_task(self.async_flush())
+
+    def _append(self, rows: dict[int, list[str]]) -> None:
+        """Append rows to the logs, blocking."""
+        os.makedirs(self.path, exist_ok=True)
+        for user_id, lines in rows.items():
+            with open(self._log_path(user_id), "a", encoding="utf-8") as log:
+                log.writelines(f"{line}\n" for line in lines)
+
+    def _compact(self, cutoff: datetime) -> None:
+        """Rewrite the logs without the rows logged before the cutoff, blocking."""
+        if not os.path.isdir(self.path):
+            return
+        for filename in os.listdir(self.path):
+            if not filename.endswith(".jsonl"):
+                continue
+            path = os.path.join(self.path, filename)
+            with open(path, encoding="utf-8") as log, open(
+                f"{path}.tmp", "w", encoding="utf-8"
+            ) as compacted:
+                # rows are in time order, everything after the first kept row is kept
+                for line in log:
+                    if dt_util.parse_datetime(json.loads(line)[0]) >= cutoff:
+                        compacted.write(line)
+                        compacted.writelines(log)
+                        break
+            os.replace(f"{path}.tmp", path)
+
+    async def _async_write_buffer(self) -> None:
+        """Append the buffered rows, the lock must be held."""
+        rows, self._buffer = self._buffer, {}
+        if rows:
+            await self.hass.async_add_executor_job(self._append, rows)
+
+    async def async_flush(self) -> None:
+        """Write buffered rows and apply the retention."""
+        async with self._lock:
+            await self._async_write_buffer()
+            now = dt_util.utcnow()
+            if self._compact_due(now):
+                await self.hass.async_add_executor_job(
+                    self._compact, now - self.retention
+                )
+                self._compacted = now
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _export(self, path: str, export_format: str, since: datetime | None) -> int:
+        """Stream the logs into an export file a chunk at a time, blocking."""
+        exported = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        filenames = sorted(os.listdir(self.path)) if os.path.isdir(self.path) else []
+        with open(path, "w", encoding="utf-8", newline="") as export:
+            writer = csv.writer(export)
+            if export_format == "csv":
+                writer.writerow(EXPORT_COLUMNS)
+            for filename in filenames:
+                if not filename.endswith(".jsonl"):
+                    continue
+                user_id = int(filename.removesuffix(".jsonl"))
+                with open(os.path.join(self.path, filename), encoding="utf-8") as log:
+                    while chunk := list(itertools.islice(log, JOB_HISTORY_EXPORT_CHUNK)):
+                        rows = [
+                            [row[0], user_id, *row[1:]]
+                            for row in map(json.loads, chunk)
+                            if since is None or dt_util.parse_datetime(row[0]) >= since
+                        ]
+                        if export_format == "csv":
+                            writer.writerows(rows)
+                        else:
+                            export.writelines(
+                                f"{json.dumps(dict(zip(EXPORT_COLUMNS, row)))}\n"
+                                for row in rows
+                            )
+                        exported += len(rows)
+        return exported
+
+    async def async_export(
+        self, export_format: str, since: datetime | None = None
+    ) -> dict:
+        """Export the history to the exports directory as CSV or JSON lines."""
+        path = os.path.join(
+            export_dir(self.hass),
+            f"job_history_{self.entry_id}_"
+            f"{dt_util.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}",
+        )
+        async with self._lock:
+            await self._async_write_buffer()
+            rows = await self.hass.async_add_executor_job(
+                self._export, path, export_format, since
+            )
+        _LOGGER.debug("Exported %s finished jobs to %s", rows, path)
+        return {"path": path, "rows": rows}
@@ -0,0 +1,151 @@
+"""Executor offload for heavy Rooster Money computations."""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+import logging
+from operator import attrgetter
+import time
+from typing import Any
+
+from pyroostermoney import RoosterMoney
+
+from homeassistant.core import HomeAssistant
+
+from .const import OFFLOAD_MIN_ITEMS
+from .helpers import encode_jobs, family_transaction_attributes
+
+_LOGGER = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+# every field encode_jobs writes, the signature must change whenever its output does
+_JOB_FIELDS = attrgetter(
+    "scheduled_job_id",
+    "master_job_id",
+    "state",
+    "title",
+    "description",
+    "reward_amount",
+    "final_reward_amount",
+    "currency",
+    "allowance_period_id",
+    "due_any_day",
+    "due_date",
+    "expiry_processed",
+    "image_url",
+    "locked",
+    "reopened",
+    "type",
+    "schedule_type",
+    "weekdays",
+)
+
+
+def job_signature(jobs: list) -> tuple:
+    """Return the content of jobs as flat tuples that compare without encoding."""
+    return tuple(map(_JOB_FIELDS, jobs))
+
+
+def transaction_signature(transactions: list[dict] | None) -> tuple:
+    """Return the content of the family transactions as flat tuples."""
+    return tuple(
+        (transaction["amount"], transaction["reason"], transaction["type"])
+        for transaction in transactions or []
+    )
+
+
+class RoosterOffload:
+    """Runs work inline while it is small and in the executor once it is large.
+
+    Results are cached per key until the signature of their inputs changes, so
+    state writes and repeated calendar queries between refreshes are a lookup.
+    pyroostermoney builds new lists and objects on every fetch, so results are
+    signed by content rather than identity, a refresh that returns the same
+    data keeps the cached result.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, rooster: RoosterMoney, threshold: int = OFFLOAD_MIN_ITEMS
+    ) -> None:
+        """Init the offload."""
+        self.hass = hass
+        self.rooster = rooster
+        self.threshold = threshold
+        self.inline = 0
+        self.offloaded = 0
+        # key -> (signature, result)
+        self._cache: dict[Hashable, tuple[Any, Any]] = {}
+
+    def _lookup(self, key: Hashable, signature: Any) -> Any:
+        """Return the cached result, or _MISSING if the inputs have changed."""
+        cached = self._cache.get(key)
+        if cached is None or cached[0] != signature:
+            return _MISSING
+        return cached[1]
+
+    def get(
+        self, key: Hashable, signature: Any, target: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Return the cached result, computing it inline if the inputs changed."""
+        if (result := self._lookup(key, signature)) is _MISSING:
+            self.inline += 1
+            result = target(*args)
+            self._cache[key] = (signature, result)
+        return result
+
+    async def async_run(
+        self,
+        key: Hashable,
+        signature: Any,
+        size: int,
+        target: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        """Return the cached result, computing it in the executor above the threshold."""
+        if (result := self._lookup(key, signature)) is not _MISSING:
+            return result
+        started = time.perf_counter()
+        if size >= self.threshold:
+            self.offloaded += 1
+            result = await self.hass.async_add_executor_job(target, *args)
+        else:
+            self.inline += 1
+            result = target(*args)
+        _LOGGER.debug(
+            "Computed %s of size %s in %.1f ms%s",
+            key,
+            size,
+            (time.perf_counter() - started) * 1000,
+            " in the executor" if size >= self.threshold else "",
+        )
+        self._cache[key] = (signature, result)
+        return result
+
+    async def async_update(self) -> None:
+        """Prepare the job and transaction attributes of the latest refresh."""
+        user_ids = set()
+        for child in self.rooster.children:
+            user_ids.add(child.user_id)
+            await self.async_run(
+                ("jobs", child.user_id),
+                job_signature(child.jobs),
+                len(child.jobs),
+                encode_jobs,
+                child.jobs,
+            )
+        transactions = self.rooster.family_account.current_month_transactions
+        await self.async_run(
+            "transactions",
+            transaction_signature(transactions),
+            len(transactions or []),
+            family_transaction_attributes,
+            transactions,
+        )
+        for key in list(self._cache):
+            if isinstance(key, tuple) and key[1] not in user_ids:
+                self._cache.pop(key)
+
+    def as_dict(self) -> dict:
+        """Return how much work ran inline and in the executor."""
+        return {"inline": self.inline, "offloaded": self.offloaded}
@@ -0,0 +1,325 @@
+"""Durable outbox for Rooster Money writes."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+import uuid
+
+import aiohttp
+from pyroostermoney import RoosterMoney
+from pyroostermoney.child import ChildAccount, StandingOrder
+from pyroostermoney.enum import JobActions
+from pyroostermoney.exceptions import (
+    AuthenticationExpired,
+    InvalidAuthError,
+    NotLoggedIn,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_MIN, OUTBOX_MAX_ATTEMPTS
+from .rate_limit import RequestBudgetExhausted
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+CONNECTION_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+# pyroostermoney raises PermissionError for 401 and 403 and ConnectionError for
+# a rejected login, retrying these cannot succeed until the credentials change
+AUTH_ERRORS = (
+    PermissionError,
+    ConnectionError,
+    AuthenticationExpired,
+    InvalidAuthError,
+    NotLoggedIn,
+)
+
+# sending these twice leaves Rooster Money in the same state as sending them once
+IDEMPOTENT_OPERATIONS = {
+    "delete_standing_order",
+    "update_allowance",
+    "perform_action_on_job",
+    "set_card_status",
+}
+
+
+def never_sent(err: BaseException | None) -> bool:
+    """Return True if a request failed before it could reach Rooster Money.
+
+    pyroostermoney re-raises connection errors without their type, the original
+    is kept as the cause.
+    """
+    while err is not None:
+        if isinstance(err, aiohttp.ClientConnectorError):
+            return True
+        err = err.__cause__
+    return False
+
+
+def can_queue(operation: str, err: BaseException) -> bool:
+    """Return True if a failed write can be sent again without applying it twice."""
+    return operation in IDEMPOTENT_OPERATIONS or never_sent(err)
+
+
+async def _boost_pot(child: ChildAccount, params: dict) -> None:
+    """Boost a pot."""
+    pots = [pot for pot in child.pots if pot.pot_id == params["pot_id"]]
+    if not pots:
+        raise ValueError("Invalid pot_id")
+    await pots[0].add_to_pot(params["amount"], params["description"])
+
+
+async def _create_standing_order(child: ChildAccount, params: dict) -> None:
+    """Create a standing order."""
+    await child.create_standing_order(
+        StandingOrder(
+            amount=params["amount"],
+            day=params["day"],
+            frequency=params["frequency"],
+            active=True,
+            tag=params["tag"],
+            title=params["title"],
+            regular_id=None,
+        )
+    )
+
+
+async def _delete_standing_order(child: ChildAccount, params: dict) -> None:
+    """Delete a standing order."""
+    for regular in child.standing_orders:
+        if regular.regular_id == params["regular_id"]:
+            await child.delete_standing_order(regular)
+            break
+
+
+async def _update_allowance(child: ChildAccount, params: dict) -> None:
+    """Update the allowance of a child."""
+    await child.update_allowance(params["paused"], params["amount"])
+
+
+async def _perform_action_on_job(child: ChildAccount, params: dict) -> None:
+    """Perform an action on a job."""
+    filtered = [job for job in child.jobs if job.scheduled_job_id == params["job_id"]]
+    if len(filtered) != 1:
+        raise ValueError("Invalid job_id")
+    if params["action"] == "APPROVE":
+        await filtered[0].job_action(JobActions.APPROVE, "")
+    else:
+        raise ValueError("Invalid or not implemented action")
+
+
+async def _set_card_status(child: ChildAccount, params: dict) -> None:
+    """Freeze or unfreeze a card."""
+    await child.card.set_card_status(params["active"])
+    # pyroostermoney only reads the status when the card is first fetched
+    child.card.status = "active" if params["active"] else "lost"
+
+
+OPERATIONS: dict[str, Callable[[ChildAccount, dict], Awaitable[None]]] = {
+    "boost_pot": _boost_pot,
+    "create_standing_order": _create_standing_order,
+    "delete_standing_order": _delete_standing_order,
+    "update_allowance": _update_allowance,
+    "perform_action_on_job": _perform_action_on_job,
+    "set_card_status": _set_card_status,
+}
+
+
+class RoosterOutbox:
+    """Queues writes that failed to reach Rooster Money and replays them in order."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rooster: RoosterMoney,
+        entry_id: str,
+        enabled: bool,
+        on_replayed: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Init the outbox."""
+        self.hass = hass
+        self.rooster = rooster
+        self.enabled = enabled
+        self.items: list[dict[str, Any]] = []
+        self._on_replayed = on_replayed
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.outbox")
+        self._failures = 0
+        self._unsub_replay: CALLBACK_TYPE | None = None
+        # items only change on the event loop, sends run outside of any lock
+        self._replaying = False
+
+    async def async_load(self) -> None:
+        """Load pending items and schedule their replay."""
+        self.items = (await self._store.async_load() or {}).get("items", [])
+        if self.items:
+            self.async_schedule_replay(0)
+
+    def _data_to_save(self) -> dict:
+        """Return the data to store."""
+        return {"items": self.items}
+
+    async def _async_execute(self, item: dict[str, Any]) -> None:
+        """Send a single item upstream."""
+        item["attempts"] += 1
+        child = self.rooster.get_child_account(item["child_id"])
+        await OPERATIONS[item["operation"]](child, item["params"])
+
+    async def async_submit(
+        self,
+        operation: str,
+        child_id: int,
+        params: dict[str, Any],
+        coalesce_key: str | None = None,
+    ) -> bool:
+        """Send a write upstream, queueing it if the API is unreachable.
+
+        Returns True if the write was sent, False if it was queued.
+        """
+        item = {
+            "id": uuid.uuid4().hex,
+            "operation": operation,
+            "child_id": child_id,
+            "params": params,
+            "coalesce_key": coalesce_key,
+            "created": dt_util.utcnow().isoformat(),
+            "attempts": 0,
+        }
+        # keep ordering, later writes wait behind anything already queued,
+        # the write pipeline sends one write per child at a time
+        if not self.items:
+            try:
+                await self._async_execute(item)
+                return True
+            except CONNECTION_ERRORS as err:
+                if not self.enabled:
+                    raise HomeAssistantError(
+                        f"Unable to reach Rooster Money: {err}"
+                    ) from err
+                if not can_queue(operation, err):
+                    # it may have been applied, a replay could move money twice
+                    raise HomeAssistantError(
+                        f"Rooster Money did not confirm {operation}, check it "
+                        f"was not applied before trying again: {err}"
+                    ) from err
+                _LOGGER.warning("Queueing %s, API unreachable: %s", operation, err)
+            except RequestBudgetExhausted as err:
+                if not self.enabled:
+                    raise
+                # nothing was sent, so any write can wait for tomorrow's budget
+                _LOGGER.warning("Queueing %s: %s", operation, err)
+            except AUTH_ERRORS as err:
+                raise HomeAssistantError(
+                    f"Rooster Money rejected {operation}, check the credentials: {err}"
+                ) from err
+        self._enqueue(item)
+        self.async_schedule_replay()
+        return False
+
+    def _enqueue(self, item: dict[str, Any]) -> None:
+        """Add an item, dropping queued items it supersedes."""
+        if item["coalesce_key"] is not None:
+            self.items = [
+                queued
+                for queued in self.items
+                if queued["coalesce_key"] != item["coalesce_key"]
+            ]
+        self.items.append(item)
+        self._store.async_delay_save(self._data_to_save)
+
+    def async_cancel(self, item_id: str) -> bool:
+        """Cancel a pending item."""
+        count = len(self.items)
+        self.items = [item for item in self.items if item["id"] != item_id]
+        if len(self.items) == count:
+            return False
+        self._store.async_delay_save(self._data_to_save)
+        return True
+
+    @callback
+    def async_schedule_replay(self, delay: float | None = None) -> None:
+        """Schedule a replay of the pending items.
+
+        Without a delay a pending replay is kept, with one it is rescheduled.
+        """
+        if not self.items or self._replaying:
+            return
+        if self._unsub_replay is not None:
+            if delay is None:
+                return
+            self._unsub_replay()
+            self._unsub_replay = None
+        if delay is None:
+            delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_MIN * 2**self._failures)
+        self._unsub_replay = async_call_later(self.hass, delay, self._async_replay)
+
+    async def _async_replay(self, _now=None) -> None:
+        """Replay pending items in order until one fails."""
+        self._unsub_replay = None
+        replayed = False
+        self._replaying = True
+        try:
+            while self.items:
+                item = self.items[0]
+                try:
+                    await self._async_execute(item)
+                except CONNECTION_ERRORS as err:
+                    if not can_queue(item["operation"], err):
+                        _LOGGER.error(
+                            "Dropping %s from outbox, Rooster Money did not confirm "
+                            "it and it may have been applied: %s",
+                            item["operation"],
+                            err,
+                        )
+                    elif item["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                        _LOGGER.error(
+                            "Dropping %s from outbox after %s attempts: %s",
+                            item["operation"],
+                            item["attempts"],
+                            err,
+                        )
+                    else:
+                        self._failures += 1
+                        _LOGGER.debug("Outbox replay failed: %s", err)
+                        break
+                except RequestBudgetExhausted as err:
+                    # nothing was sent, waiting for the budget is not a failed attempt
+                    item["attempts"] -= 1
+                    self._failures += 1
+                    _LOGGER.debug("Outbox replay paused: %s", err)
+                    break
+                except AUTH_ERRORS as err:
+                    _LOGGER.error(
+                        "Dropping %s from outbox, Rooster Money rejected the "
+                        "credentials: %s",
+                        item["operation"],
+                        err,
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Dropping %s from outbox", item["operation"])
+                else:
+                    self._failures = 0
+                    replayed = True
+                # the item may have been cancelled or superseded while it was sent
+                self.items = [queued for queued in self.items if queued is not item]
+                # save after every item so a restart never replays a sent write
+                await self._store.async_save(self._data_to_save())
+        finally:
+            self._replaying = False
+        if replayed:
+            await self._on_replayed()
+        self.async_schedule_replay()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending replay and flush the queue to disk."""
+        if self._unsub_replay is not None:
+            self._unsub_replay()
+            self._unsub_replay = None
+        await self._store.async_save(self._data_to_save())
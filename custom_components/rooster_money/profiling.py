@@ -0,0 +1,98 @@
+"""On-demand profiling of Rooster Money refreshes."""
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .update_coordinator import RoosterCoordinator
+
+HOT_SPOT_GROUPS = {
+    "pyroostermoney": "pyroostermoney",
+    "job_encoder": "rooster_money/helpers.py",
+    "calendar": "rooster_money/calendar.py",
+    "state_writes": "homeassistant/helpers/entity.py",
+    "aiohttp": "aiohttp",
+}
+
+
+def profile_dir(hass: HomeAssistant) -> str:
+    """Return the directory profiles are written to."""
+    return hass.config.path(f"{DOMAIN}_profiles")
+
+
+def dump(profiler: cProfile.Profile, path: str, top: int) -> None:
+    """Write the stats and the text table of a profile, blocking."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
+    write_table(profiler, path.replace(".pstats", ".txt"), top)
+
+
+def write_table(profiler: cProfile.Profile, path: str, top: int) -> None:
+    """Write the top-N functions by cumulative time as a text table."""
+    with open(path, "w", encoding="utf-8") as table:
+        pstats.Stats(profiler, stream=table).sort_stats("cumulative").print_stats(top)
+
+
+def summarise(profiler: cProfile.Profile, top: int) -> dict:
+    """Return the top-N hot spots and the time spent per group."""
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    groups = dict.fromkeys(HOT_SPOT_GROUPS, 0.0)
+    for (filename, _, _), (_, _, total_time, _, _) in stats.items():
+        for group, path in HOT_SPOT_GROUPS.items():
+            if path in filename.replace("\\", "/"):
+                groups[group] += total_time
+    return {
+        "groups": {group: round(value, 4) for group, value in groups.items()},
+        "hot_spots": [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_time": round(total_time, 4),
+                "cumulative_time": round(cumulative_time, 4),
+            }
+            for (filename, line, name), (
+                _,
+                calls,
+                total_time,
+                cumulative_time,
+                _,
+            ) in rows[:top]
+        ],
+    }
+
+
+async def async_profile_refreshes(
+    hass: HomeAssistant, coordinator: RoosterCoordinator, refreshes: int, top: int
+) -> dict:
+    """Profile forced refreshes and the state writes they trigger.
+
+    The refreshes run back to back rather than on their schedule. cProfile sees
+    everything the event loop runs meanwhile, but none of the executor jobs.
+    """
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        for _ in range(refreshes):
+            # listeners write their state inside async_refresh
+            await coordinator.async_refresh()
+    finally:
+        profiler.disable()
+    elapsed = time.perf_counter() - started
+    profiler.create_stats()
+
+    path = os.path.join(
+        profile_dir(hass),
+        f"{coordinator.config_entry.entry_id}_"
+        f"{dt_util.utcnow().strftime('%Y%m%d%H%M%S')}.pstats",
+    )
+    await hass.async_add_executor_job(dump, profiler, path, top)
+    summary = await hass.async_add_executor_job(summarise, profiler, top)
+    return {"path": path, "refreshes": refreshes, "elapsed": round(elapsed, 4), **summary}
@@ -0,0 +1,72 @@
+"""Push ingestion of change hints for Rooster Money."""
+from __future__ import annotations
+
+from http import HTTPStatus
+import logging
+
+from aiohttp.web import Request, Response
+import voluptuous as vol
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.network import NoURLAvailableError
+
+from .const import DOMAIN, TARGETED_REFRESH_RESOURCES
+from .update_coordinator import RoosterCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+HINT_SCHEMA = vol.Schema(
+    {
+        vol.Required("child_id"): vol.Coerce(int),
+        vol.Required("resource"): vol.In(list(TARGETED_REFRESH_RESOURCES)),
+    }
+)
+
+
+@callback
+def webhook_url(hass: HomeAssistant, webhook_id: str) -> str:
+    """Return the URL change hints are posted to, or its path without a known URL."""
+    try:
+        return webhook.async_generate_url(hass, webhook_id)
+    except NoURLAvailableError:
+        return webhook.async_generate_path(webhook_id)
+
+
+async def async_setup_webhook(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: RoosterCoordinator
+) -> None:
+    """Register the change hint webhook for a config entry."""
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if webhook_id is None:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+
+    async def handle_webhook(
+        hass: HomeAssistant, webhook_id: str, request: Request
+    ) -> Response:
+        """Handle a change hint."""
+        try:
+            hint = HINT_SCHEMA(await request.json())
+        except (ValueError, vol.Invalid) as err:
+            return Response(text=str(err), status=HTTPStatus.BAD_REQUEST)
+
+        child_ids = [child.user_id for child in coordinator.rooster.children]
+        if hint["child_id"] not in child_ids:
+            return Response(text="Unknown child_id", status=HTTPStatus.NOT_FOUND)
+
+        _LOGGER.debug("Received change hint %s", hint)
+        await coordinator.async_request_targeted_refresh(
+            hint["child_id"], hint["resource"]
+        )
+        return Response(status=HTTPStatus.ACCEPTED)
+
+    webhook.async_register(
+        hass, DOMAIN, "Natwest Rooster Money", webhook_id, handle_webhook
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+    _LOGGER.debug("Change hints accepted at %s", webhook_url(hass, webhook_id))
@@ -0,0 +1,125 @@
+"""Request rate limiting for Rooster Money."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    RATE_LIMIT_BUDGET_LOW,
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_PER_SECOND,
+    RATE_LIMIT_WRITE_RESERVE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestBudgetExhausted(HomeAssistantError):
+    """Error to indicate today's request budget has been used up."""
+
+
+def is_write(kwargs: dict[str, Any]) -> bool:
+    """Return True if a request changes state or carries credentials.
+
+    Every POST, PUT and DELETE of pyroostermoney changes state, its lookups
+    (master jobs, family account, statements) are all GETs.
+    """
+    return (
+        str(kwargs.get("method", "GET")).upper() != "GET"
+        or kwargs.get("auth") is not None
+    )
+
+
+class RoosterRateLimiter:
+    """A token bucket with an optional daily budget shared by all requests.
+
+    Writes may use every token in the bucket, reads leave a reserve behind so an
+    interactive write never queues behind a burst of background polls. Polls
+    stop once the budget runs low, every other request fails once it is spent.
+    """
+
+    def __init__(
+        self,
+        daily_budget: int = 0,
+        capacity: int = RATE_LIMIT_CAPACITY,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        write_reserve: int = RATE_LIMIT_WRITE_RESERVE,
+    ) -> None:
+        """Init the limiter, a daily_budget of 0 disables the budget."""
+        self.daily_budget = daily_budget
+        self.capacity = capacity
+        self.rate = rate
+        self.write_reserve = min(write_reserve, capacity - 1)
+        self.tokens = float(capacity)
+        self.used_today = 0
+        self.skipped_polls = 0
+        self._day = dt_util.now().date()
+        self._updated = time.monotonic()
+        self._waiting_writes = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last call and roll the daily budget."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        today = dt_util.now().date()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+
+    @property
+    def budget_remaining(self) -> int | None:
+        """Return the requests left in today's budget."""
+        if not self.daily_budget:
+            return None
+        self._refill()
+        return max(0, self.daily_budget - self.used_today)
+
+    def allow_poll(self) -> bool:
+        """Return if a background poll should run now."""
+        remaining = self.budget_remaining
+        if remaining is None or remaining > self.daily_budget * RATE_LIMIT_BUDGET_LOW:
+            return True
+        self.skipped_polls += 1
+        return False
+
+    async def acquire(self, write: bool) -> None:
+        """Wait for a token, writes take priority over reads.
+
+        Raises RequestBudgetExhausted once today's budget is spent.
+        """
+        if write:
+            self._waiting_writes += 1
+        try:
+            while True:
+                self._refill()
+                if self.budget_remaining == 0:
+                    raise RequestBudgetExhausted(
+                        f"The daily budget of {self.daily_budget} Rooster Money "
+                        "requests has been used"
+                    )
+                needed = 1 if write else 1 + self.write_reserve
+                if self.tokens >= needed and (write or not self._waiting_writes):
+                    self.tokens -= 1
+                    self.used_today += 1
+                    return
+                await asyncio.sleep(max(needed - self.tokens, 1) / self.rate)
+        finally:
+            if write:
+                self._waiting_writes -= 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current usage of the limiter."""
+        self._refill()
+        return {
+            "tokens_available": int(self.tokens),
+            "capacity": self.capacity,
+            "daily_budget": self.daily_budget or None,
+            "budget_remaining": self.budget_remaining,
+            "skipped_polls": self.skipped_polls,
+        }
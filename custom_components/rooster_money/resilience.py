@@ -0,0 +1,146 @@
+"""Per-request deadlines, retries and hedging for Rooster Money."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import functools
+import logging
+import random
+import re
+import time
+from typing import Any
+
+import aiohttp
+import async_timeout
+
+from .const import (
+    HEDGE_MIN_SAMPLES,
+    REQUEST_RETRIES,
+    REQUEST_RETRY_BACKOFF,
+    REQUEST_TIMEOUT,
+)
+from .rate_limit import is_write
+
+_LOGGER = logging.getLogger(__name__)
+
+RETRY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError)
+
+
+class RoosterRequestPolicy:
+    """Applies a deadline to every request and retries or hedges idempotent GETs.
+
+    With an acquire callback every attempt, including retries and hedges, waits
+    for it before the deadline starts, so a rate limiter sees each HTTP call.
+    """
+
+    def __init__(
+        self,
+        hedge: bool = False,
+        timeout: float = REQUEST_TIMEOUT,
+        retries: int = REQUEST_RETRIES,
+    ) -> None:
+        """Init the policy."""
+        self.hedge = hedge
+        self.timeout = timeout
+        self.retries = retries
+        self.retried = 0
+        self.hedged = 0
+        self._latency: dict[str, deque[float]] = {}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Group urls of the same endpoint together."""
+        return re.sub(r"\d+", "{id}", url.split("?")[0])
+
+    def p95(self, key: str) -> float | None:
+        """Return the 95th percentile latency of an endpoint."""
+        samples = self._latency.get(key)
+        if samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    async def _timed(self, key: str, handler, acquire, args, kwargs) -> Any:
+        """Run the request within the deadline and record its latency."""
+        if acquire is not None:
+            await acquire(is_write(kwargs))
+        started = time.monotonic()
+        async with async_timeout.timeout(self.timeout):
+            result = await handler(*args, **kwargs)
+        self._latency.setdefault(key, deque(maxlen=100)).append(
+            time.monotonic() - started
+        )
+        return result
+
+    async def _hedged(self, key: str, handler, acquire, args, kwargs) -> Any:
+        """Send a second request if the first is slower than the p95.
+
+        The first request to succeed wins, an error is only raised once every
+        request has failed.
+        """
+        p95 = self.p95(key)
+        if p95 is None:
+            return await self._timed(key, handler, acquire, args, kwargs)
+        tasks = {
+            asyncio.create_task(self._timed(key, handler, acquire, args, kwargs))
+        }
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=p95)
+            if not done:
+                self.hedged += 1
+                _LOGGER.debug("Hedging slow request to %s", key)
+                tasks.add(
+                    asyncio.create_task(
+                        self._timed(key, handler, acquire, args, kwargs)
+                    )
+                )
+                pending = set(tasks)
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def wrap(
+        self,
+        request_handler: Callable[..., Awaitable[Any]],
+        acquire: Callable[[bool], Awaitable[None]] | None = None,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Return a request handler with deadlines and retries applied."""
+
+        @functools.wraps(request_handler)
+        async def policy_request_handler(*args, **kwargs):
+            url = kwargs.get("url", args[0] if args else "")
+            idempotent = not is_write(kwargs)
+            key = self._key(url)
+            attempts = self.retries + 1 if idempotent else 1
+            for attempt in range(attempts):
+                try:
+                    if idempotent and self.hedge:
+                        return await self._hedged(
+                            key, request_handler, acquire, args, kwargs
+                        )
+                    return await self._timed(
+                        key, request_handler, acquire, args, kwargs
+                    )
+                except RETRY_ERRORS as err:
+                    if attempt + 1 >= attempts:
+                        raise
+                    self.retried += 1
+                    delay = REQUEST_RETRY_BACKOFF * 2**attempt
+                    _LOGGER.debug(
+                        "Request to %s failed (%s), retrying in %.1fs", key, err, delay
+                    )
+                    await asyncio.sleep(random.uniform(0, delay))
+
+        return policy_request_handler
@@ -4,10 +4,9 @@ from __future__ import annotations
 import logging
 
 from pyroostermoney import RoosterMoney
-from pyroostermoney.child import ChildAccount, StandingOrder
+from pyroostermoney.child import ChildAccount
 from pyroostermoney.const import MOBILE_APP_VERSION
 from pyroostermoney.family_account import FamilyAccount
-from pyroostermoney.enum import JobActions
 
 import homeassistant.helpers.device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo, Entity
@@ -31,16 +30,29 @@ class RoosterChildEntity(CoordinatorEntity, Entity):
         self._child_id = child_id
         self._entity_id = entity_id
         self.coordinator: RoosterCoordinator = coordinator
+        self._last_child: ChildAccount | None = None
 
     @property
     def _child(self) -> ChildAccount:
-        """Returns the child data."""
-        return self.coordinator.rooster.get_child_account(self._child_id)
+        """Returns the child data, or the last known data once it is removed."""
+        for child in self.coordinator.rooster.children:
+            if child.user_id == self._child_id:
+                self._last_child = child
+                return child
+        return self._last_child
+
+    @property
+    def available(self) -> bool:
+        """Return if the child still exists."""
+        return super().available and any(
+            child.user_id == self._child_id
+            for child in self.coordinator.rooster.children
+        )
 
     @property
     def unique_id(self):
         """Return the uniqueid of the child."""
-        return f"roostermoney_{self._child.user_id}_{self._entity_id}"
+        return f"roostermoney_{self._child_id}_{self._entity_id}"
 
     @property
     def device_info(self):
@@ -55,24 +67,27 @@ class RoosterChildEntity(CoordinatorEntity, Entity):
 
     async def async_create_standing_order(self, amount, day, frequency, tag, title):
         """Service to create a standing order."""
-        standing_order = StandingOrder(
-            amount=amount,
-            day=day,
-            frequency=frequency,
-            active=True,
-            tag=tag,
-            title=title,
-            regular_id=None,
+        await self.coordinator.writes.async_submit(
+            "create_standing_order",
+            self._child_id,
+            {
+                "amount": amount,
+                "day": day,
+                "frequency": frequency,
+                "tag": tag,
+                "title": title,
+            },
         )
-        await self._child.create_standing_order(standing_order)
-        await self.coordinator.async_refresh_request()
+        await self.coordinator.async_request_refresh()
 
     async def async_delete_standing_order(self, regular_id: str):
         """Deletes a standing order according to its ID"""
         for regular in self._child.standing_orders:
             if regular.regular_id == regular_id:
-                await self._child.delete_standing_order(regular)
-                await self.coordinator.async_refresh_request()
+                await self.coordinator.writes.async_submit(
+                    "delete_standing_order", self._child_id, {"regular_id": regular_id}
+                )
+                await self.coordinator.async_request_refresh()
                 break
 
     async def async_get_standing_orders(self) -> ServiceResponse:
@@ -91,7 +106,13 @@ class RoosterChildEntity(CoordinatorEntity, Entity):
 
     async def async_update_allowance(self, amount: float, active: bool):
         """Updates the child allowance."""
-        await self._child.update_allowance(not active, amount)
+        await self.coordinator.writes.async_submit(
+            "update_allowance",
+            self._child_id,
+            {"paused": not active, "amount": amount},
+            coalesce_key=f"allowance_{self._child_id}",
+            optimistic=active,
+        )
 
     async def async_perform_action_on_job(self, action: str, job_id: int):
         """Performs an action on a job."""
@@ -99,13 +120,15 @@ class RoosterChildEntity(CoordinatorEntity, Entity):
         filtered = list(
             filter(lambda job: job.scheduled_job_id == job_id, self._child.jobs)
         )
-        if len(filtered) == 1:
-            if action == "APPROVE":
-                await filtered[0].job_action(JobActions.APPROVE, "")
-            else:
-                raise ValueError("Invalid or not implemented action")
-        else:
+        if len(filtered) != 1:
             raise ValueError("Invalid job_id")
+        if action != "APPROVE":
+            raise ValueError("Invalid or not implemented action")
+        await self.coordinator.writes.async_submit(
+            "perform_action_on_job",
+            self._child_id,
+            {"job_id": job_id, "action": action},
+        )
         await self.coordinator.async_request_refresh()
         return True
 
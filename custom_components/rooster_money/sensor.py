@@ -4,7 +4,6 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
 import logging
-import json
 
 from pyroostermoney import RoosterMoney
 from pyroostermoney.child import ChildAccount, Pot
@@ -12,21 +11,31 @@ from pyroostermoney.family_account import FamilyAccount
 
 from homeassistant.components.sensor.const import SensorStateClass
 from .update_coordinator import RoosterCoordinator
-from .helpers import JobEncoder
+from .helpers import encode_jobs, family_transaction_attributes
+from .offload import job_signature, transaction_signature
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
 from .const import (
     DOMAIN,
     FAMILY_ACCOUNT_ATTR_MAP,
+    FAMILY_AGGREGATE_ATTR_MAP,
+    FAMILY_ANALYTICS_ATTR_MAP,
     CHILD_ACCOUNT_ATTR_MAP,
+    CHILD_ANALYTICS_ATTR_MAP,
+    CHILD_JOB_BOARD_ATTR_MAP,
     ENTITY_SERVICES,
 )
+from .entity_factory import PlatformEntities
 from .rooster_base import RoosterChildEntity, RoosterFamilyEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,56 +47,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Rooster Money session."""
-    # Get a list of all children in account
-    children = hass.data[DOMAIN][config_entry.entry_id].rooster.children
-    entities = []
-    for child in children:
-        entities.append(
-            RoosterChildMoneySensor(
-                coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                idx=None,
-                child_id=child.user_id,
-            )
-        )
-        entities.append(
-            RoosterChildLastTransactionSensor(
-                coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                idx=None,
-                child_id=child.user_id,
-            )
-        )
-        entities.append(
-            RoosterChildJobSensor(
-                coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                idx=None,
-                child_id=child.user_id,
-            )
-        )
-        for pot in child.pots:
-            entities.append(
-                RoosterPotSensor(
-                    coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                    idx=None,
-                    child_id=child.user_id,
-                    pot_id=pot.pot_id,
-                )
-            )
-
-    # Create the family account entities
-    family_account = hass.data[DOMAIN][config_entry.entry_id].rooster.family_account
-    for attr in FAMILY_ACCOUNT_ATTR_MAP:
-        entities.append(
-            RoosterFamilySensor(
-                family_account, hass.data[DOMAIN][config_entry.entry_id].rooster, attr
-            )
-        )
-    entities.append(
-        RoosterFamilyTransactionSensor(
-            family_account, hass.data[DOMAIN][config_entry.entry_id].rooster
-        )
+    coordinator: RoosterCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator.entity_factory.async_add_platform(
+        Platform.SENSOR,
+        PlatformEntities(
+            async_add_entities,
+            family=build_family_sensors,
+            child=build_child_sensors,
+            pot=build_pot_sensors,
+        ),
     )
-
-    async_add_entities(entities, True)
     platform = entity_platform.async_get_current_platform()
     # register services
     for service in ENTITY_SERVICES:
@@ -101,6 +70,65 @@ async def async_setup_entry(
         )
 
 
+def build_child_sensors(
+    coordinator: RoosterCoordinator, child: ChildAccount
+) -> list[SensorEntity]:
+    """Build the sensors of a child account."""
+    entities = [
+        RoosterChildMoneySensor(coordinator=coordinator, idx=None, child_id=child.user_id),
+        RoosterChildLastTransactionSensor(
+            coordinator=coordinator, idx=None, child_id=child.user_id
+        ),
+        RoosterChildJobSensor(coordinator=coordinator, idx=None, child_id=child.user_id),
+    ]
+    for attr in CHILD_JOB_BOARD_ATTR_MAP:
+        entities.append(
+            RoosterChildJobBoardSensor(
+                coordinator=coordinator, idx=None, child_id=child.user_id, attr=attr
+            )
+        )
+    for attr in CHILD_ANALYTICS_ATTR_MAP:
+        entities.append(
+            RoosterChildAnalyticsSensor(
+                coordinator=coordinator, idx=None, child_id=child.user_id, attr=attr
+            )
+        )
+    return entities
+
+
+def build_pot_sensors(
+    coordinator: RoosterCoordinator, child: ChildAccount, pot: Pot
+) -> list[SensorEntity]:
+    """Build the sensors of a money pot."""
+    # the progress sensor is unavailable while the pot has no target
+    return [
+        RoosterPotSensor(
+            coordinator=coordinator, idx=None, child_id=child.user_id, pot_id=pot.pot_id
+        ),
+        RoosterPotProgressSensor(
+            coordinator=coordinator, idx=None, child_id=child.user_id, pot_id=pot.pot_id
+        ),
+    ]
+
+
+def build_family_sensors(
+    coordinator: RoosterCoordinator, family_account: FamilyAccount
+) -> list[SensorEntity]:
+    """Build the sensors of the family account."""
+    entities = [
+        RoosterFamilySensor(family_account, coordinator.rooster, attr)
+        for attr in FAMILY_ACCOUNT_ATTR_MAP
+    ]
+    entities.append(RoosterFamilyTransactionSensor(coordinator, family_account))
+    entities.append(RoosterRequestBudgetSensor(coordinator, family_account))
+    entities.append(RoosterOutboxSensor(coordinator, family_account))
+    for attr in FAMILY_AGGREGATE_ATTR_MAP:
+        entities.append(RoosterFamilyAggregateSensor(coordinator, family_account, attr))
+    for attr in FAMILY_ANALYTICS_ATTR_MAP:
+        entities.append(RoosterFamilyAnalyticsSensor(coordinator, family_account, attr))
+    return entities
+
+
 class RoosterChildLastTransactionSensor(RoosterChildEntity, SensorEntity):
     """A sensor for Rooster Money."""
 
@@ -140,8 +168,8 @@ class RoosterChildLastTransactionSensor(RoosterChildEntity, SensorEntity):
         }
 
 
-class RoosterPotSensor(RoosterChildEntity, SensorEntity):
-    """A Rooster pot."""
+class RoosterPotBaseSensor(RoosterChildEntity, SensorEntity):
+    """Base class for the sensors of a Rooster pot."""
 
     def __init__(
         self,
@@ -149,19 +177,50 @@ class RoosterPotSensor(RoosterChildEntity, SensorEntity):
         idx,
         child_id: int,
         pot_id: str,
+        entity_id: str,
     ) -> None:
-        super().__init__(coordinator, idx, child_id, f"{pot_id}_pot")
-        self._attr = CHILD_ACCOUNT_ATTR_MAP.get("pot")
+        super().__init__(coordinator, idx, child_id, entity_id)
         self._pot_id = pot_id
+        self._last_pot: Pot | None = None
 
     @property
-    def _pot(self) -> Pot:
-        """Gets the pot."""
-        return [x for x in self._child.pots if x.pot_id == self._pot_id][0]
+    def _pot(self) -> Pot | None:
+        """Gets the pot, or the last known pot, None if it was never seen."""
+        for pot in self._child.pots:
+            if pot.pot_id == self._pot_id:
+                self._last_pot = pot
+                return pot
+        return self._last_pot
+
+    @property
+    def _pot_name(self) -> str:
+        """Returns the name of the pot, or its id if it was never seen."""
+        return self._pot.name if self._pot is not None else self._pot_id
+
+    @property
+    def available(self) -> bool:
+        """Return if the pot still exists."""
+        return super().available and any(
+            pot.pot_id == self._pot_id for pot in self._child.pots
+        )
+
+
+class RoosterPotSensor(RoosterPotBaseSensor):
+    """A Rooster pot."""
+
+    def __init__(
+        self,
+        coordinator: RoosterCoordinator,
+        idx,
+        child_id: int,
+        pot_id: str,
+    ) -> None:
+        super().__init__(coordinator, idx, child_id, pot_id, f"{pot_id}_pot")
+        self._attr = CHILD_ACCOUNT_ATTR_MAP.get("pot")
 
     @property
     def name(self) -> str:
-        return str(self._attr.get("name")).format(pot_name=self._pot.name)
+        return str(self._attr.get("name")).format(pot_name=self._pot_name)
 
     @property
     def native_unit_of_measurement(self) -> str | None:
@@ -172,26 +231,126 @@ class RoosterPotSensor(RoosterChildEntity, SensorEntity):
         return self._attr.get("device_class")
 
     @property
-    def native_value(self) -> Decimal:
-        return self._pot.value
+    def native_value(self) -> Decimal | None:
+        return self._pot.value if self._pot is not None else None
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        if self._pot is None:
+            return {"id": self._pot_id}
         return {"target": self._pot.target, "id": self._pot.pot_id}
 
     @property
     def entity_picture(self) -> str | None:
-        return self._pot.image
+        if self._pot is None:
+            return None
+        return self.coordinator.images.async_get_url(self._pot.image)
 
     @property
     def enabled(self) -> bool:
-        return self._pot.enabled
+        return self._pot is None or self._pot.enabled
 
     async def async_boost_pot(
         self, amount: float, description: str = "Boost from Home Assistant"
     ):
         """Boost a pot."""
-        await self._pot.add_to_pot(amount, description)
+        await self.coordinator.writes.async_submit(
+            "boost_pot",
+            self._child_id,
+            {"pot_id": self._pot_id, "amount": amount, "description": description},
+        )
+
+
+class RoosterPotProgressSensor(RoosterPotBaseSensor):
+    """Progress of a Rooster pot toward its target, available while it has one."""
+
+    def __init__(
+        self,
+        coordinator: RoosterCoordinator,
+        idx,
+        child_id: int,
+        pot_id: str,
+    ) -> None:
+        super().__init__(coordinator, idx, child_id, pot_id, f"{pot_id}_pot_progress")
+
+    @property
+    def available(self) -> bool:
+        """Return if the pot still exists and has a target."""
+        return super().available and bool(self._pot.target)
+
+    @property
+    def name(self) -> str:
+        return f"{self._pot_name} Pot Progress"
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        return "%"
+
+    @property
+    def state_class(self) -> SensorStateClass | str | None:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def icon(self) -> str | None:
+        return "mdi:piggy-bank-outline"
+
+    @property
+    def native_value(self) -> float | None:
+        return self.coordinator.analytics.pot_progress(self._child, self._pot_id)
+
+
+class RoosterChildAnalyticsSensor(RoosterChildEntity, SensorEntity):
+    """A running spending or savings aggregate for a child."""
+
+    def __init__(
+        self, coordinator: RoosterCoordinator, idx, child_id: int, attr: str
+    ) -> None:
+        super().__init__(coordinator, idx, child_id, attr)
+        self._attr = attr
+        self._attr_config: dict = CHILD_ANALYTICS_ATTR_MAP.get(attr)
+
+    @property
+    def _value(self):
+        """Returns the aggregate for this sensor."""
+        return getattr(self.coordinator.analytics.child(self._child_id), self._attr)
+
+    @property
+    def name(self) -> str:
+        return self._attr_config.get("name")
+
+    @property
+    def icon(self) -> str | None:
+        return self._attr_config.get("icon")
+
+    @property
+    def native_value(self) -> float:
+        value = self._value
+        if isinstance(value, float):
+            return round(value, 2)
+        return round(value.total, 2)
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Returns the unit of measurement for this sensor."""
+        return str(self._child.currency).upper()
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        return SensorDeviceClass.MONETARY
+
+    @property
+    def suggested_display_precision(self) -> int:
+        """Returns the display precision (2 decimal places)."""
+        return 2
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        value = self._value
+        if isinstance(value, float):
+            return None
+        return {
+            "by_type": {key: round(amount, 2) for key, amount in value.by_type.items()}
+        }
 
 
 class RoosterChildMoneySensor(RoosterChildEntity, SensorEntity):
@@ -225,13 +384,14 @@ class RoosterChildMoneySensor(RoosterChildEntity, SensorEntity):
 
     @property
     def entity_picture(self) -> str | None:
-        return self._child.profile_image
+        return self.coordinator.images.async_get_url(self._child.profile_image)
 
 
 class RoosterChildJobSensor(RoosterChildEntity, SensorEntity):
     """A job sensor that contains an array of jobs for the current allowance period."""
 
     def __init__(self, coordinator: RoosterCoordinator, idx, child_id: int) -> None:
+        """Initialize the sensor."""
         super().__init__(coordinator, idx, child_id, "allowance_jobs")
 
     @property
@@ -240,35 +400,99 @@ class RoosterChildJobSensor(RoosterChildEntity, SensorEntity):
 
     @property
     def native_value(self) -> int:
+        """Return the state of the sensor."""
         return len(self._child.jobs)
 
     @property
     def native_unit_of_measurement(self) -> str | None:
+        """Return the unit of measurement."""
         return "Jobs(s)"
 
     @property
     def state_class(self) -> SensorStateClass | str | None:
+        """Return the state class."""
         return SensorStateClass.MEASUREMENT
 
     @property
     def icon(self) -> str | None:
+        """Return the icon."""
         return "mdi:broom"
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Returns an array of jobs."""
+        jobs = self._child.jobs
         return {
-            "jobs": json.dumps(self._child.jobs, cls=JobEncoder),
-            "count": len(self._child.jobs),
+            "jobs": self.coordinator.offload.get(
+                ("jobs", self._child_id), job_signature(jobs), encode_jobs, jobs
+            ),
+            "count": len(jobs),
         }
 
 
+class RoosterChildJobBoardSensor(RoosterChildEntity, SensorEntity):
+    """The number of jobs in a state, or the reward still to be paid."""
+
+    def __init__(
+        self, coordinator: RoosterCoordinator, idx, child_id: int, attr: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, idx, child_id, f"jobs_{attr}")
+        self._attr = attr
+        self._attr_config: dict = CHILD_JOB_BOARD_ATTR_MAP.get(attr)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return self._attr_config.get("name")
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return self._attr_config.get("icon")
+
+    @property
+    def native_value(self) -> float | int:
+        """Return the state of the sensor."""
+        board = self.coordinator.aggregates.board(self._child_id)
+        if self._attr == "pending_reward":
+            return round(board.pending_reward, 2)
+        return board.counts[self._attr]
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit of measurement."""
+        if self._attr_config.get("monetary"):
+            return str(self._child.currency).upper()
+        return "Jobs(s)"
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class."""
+        if self._attr_config.get("monetary"):
+            return SensorDeviceClass.MONETARY
+        return None
+
+    @property
+    def state_class(self) -> SensorStateClass | str | None:
+        """Return the state class."""
+        if self._attr_config.get("monetary"):
+            return None
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def suggested_display_precision(self) -> int | None:
+        """Return the suggested number of decimals."""
+        return 2 if self._attr_config.get("monetary") else None
+
+
 class RoosterFamilySensor(RoosterFamilyEntity, SensorEntity):
     """A sensor for Rooster Money."""
 
     def __init__(
         self, account: FamilyAccount, session: RoosterMoney, attr: str
     ) -> None:
+        """Initialize the sensor."""
         super().__init__(account, session, attr)
         self._attr = attr
         self._attr_config: dict = FAMILY_ACCOUNT_ATTR_MAP.get(attr)
@@ -291,6 +515,7 @@ class RoosterFamilySensor(RoosterFamilyEntity, SensorEntity):
 
     @property
     def name(self) -> str:
+        """Return the name of the sensor."""
         return f"Family Account {self._attr_config.get('name')}"
 
     @property
@@ -305,17 +530,21 @@ class RoosterFamilySensor(RoosterFamilyEntity, SensorEntity):
 
     @property
     def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class."""
         return self._attr_config.get("device_class", None)
 
 
 class RoosterFamilyTransactionSensor(RoosterFamilyEntity, SensorEntity):
     """A sensor for Rooster Money."""
 
-    def __init__(self, account: FamilyAccount, session: RoosterMoney) -> None:
-        super().__init__(account, session, "latest_transaction")
+    def __init__(self, coordinator: RoosterCoordinator, account: FamilyAccount) -> None:
+        """Initialize the sensor."""
+        super().__init__(account, coordinator.rooster, "latest_transaction")
+        self.coordinator: RoosterCoordinator = coordinator
 
     @property
     def native_value(self) -> float:
+        """Return the state of the sensor."""
         if self._account.latest_transaction is None:
             return 0
         return self._account.latest_transaction["amount"]
@@ -327,6 +556,7 @@ class RoosterFamilyTransactionSensor(RoosterFamilyEntity, SensorEntity):
 
     @property
     def name(self) -> str:
+        """Return the name of the sensor."""
         return "Family Account Latest Transaction"
 
     @property
@@ -336,12 +566,211 @@ class RoosterFamilyTransactionSensor(RoosterFamilyEntity, SensorEntity):
 
     @property
     def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class."""
         return SensorDeviceClass.MONETARY
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes."""
+        transactions = self._account.current_month_transactions
+        return self.coordinator.offload.get(
+            "transactions",
+            transaction_signature(transactions),
+            family_transaction_attributes,
+            transactions,
+        )
+
+
+class RoosterFamilyAnalyticsSensor(CoordinatorEntity, RoosterFamilyEntity, SensorEntity):
+    """A running spending or savings aggregate across all children."""
+
+    def __init__(
+        self, coordinator: RoosterCoordinator, account: FamilyAccount, attr: str
+    ) -> None:
+        """Initialize the sensor."""
+        CoordinatorEntity.__init__(self, coordinator)
+        RoosterFamilyEntity.__init__(self, account, coordinator.rooster, attr)
+        self.coordinator: RoosterCoordinator = coordinator
+        self._attr_config: dict = FAMILY_ANALYTICS_ATTR_MAP.get(attr)
+
+    @property
+    def native_value(self) -> float:
+        """Return the state of the sensor."""
+        return round(self.coordinator.analytics.family_total(self._attr), 2)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return self._attr_config.get("name")
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return self._attr_config.get("icon")
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit of measurement for this sensor."""
+        return str(self._account.currency).upper()
+
+    @property
+    def suggested_display_precision(self) -> int | None:
+        """Returns the display precision (2 decimal places)."""
+        return 2
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class."""
+        return SensorDeviceClass.MONETARY
+
+
+class RoosterFamilyAggregateSensor(
+    CoordinatorEntity, RoosterFamilyEntity, SensorEntity
+):
+    """A household total, only written when it changes."""
+
+    def __init__(
+        self, coordinator: RoosterCoordinator, account: FamilyAccount, attr: str
+    ) -> None:
+        """Initialize the sensor."""
+        CoordinatorEntity.__init__(self, coordinator)
+        RoosterFamilyEntity.__init__(self, account, coordinator.rooster, attr)
+        self.coordinator: RoosterCoordinator = coordinator
+        self._attr_config: dict = FAMILY_AGGREGATE_ATTR_MAP.get(attr)
+        self._written = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write if neither the total nor availability changed."""
+        written = (self.available, self.native_value)
+        if written != self._written:
+            self._written = written
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float:
+        """Return the state of the sensor."""
+        return self.coordinator.aggregates.family[self._attr]
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return self._attr_config.get("name")
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return self._attr_config.get("icon")
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit of measurement."""
+        if self._attr_config.get("monetary"):
+            return str(self._account.currency).upper()
+        return "Jobs(s)"
+
+    @property
+    def suggested_display_precision(self) -> int | None:
+        """Return the suggested number of decimals."""
+        return 2 if self._attr_config.get("monetary") else None
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class."""
+        if self._attr_config.get("monetary"):
+            return SensorDeviceClass.MONETARY
+        return None
+
+    @property
+    def state_class(self) -> SensorStateClass | str | None:
+        """Return the state class."""
+        if self._attr_config.get("monetary"):
+            return None
+        return SensorStateClass.MEASUREMENT
+
+
+class RoosterRequestBudgetSensor(CoordinatorEntity, RoosterFamilyEntity, SensorEntity):
+    """Requests made to Rooster Money today."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: RoosterCoordinator, account: FamilyAccount) -> None:
+        """Initialize the sensor."""
+        CoordinatorEntity.__init__(self, coordinator)
+        RoosterFamilyEntity.__init__(
+            self, account, coordinator.rooster, "request_budget"
+        )
+        self.coordinator: RoosterCoordinator = coordinator
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.limiter.used_today
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return "Requests Today"
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return "mdi:api"
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit of measurement."""
+        return "requests"
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes."""
+        return {
+            **self.coordinator.limiter.as_dict(),
+            "retried": self.coordinator.policy.retried,
+            "hedged": self.coordinator.policy.hedged,
+        }
+
+
+class RoosterOutboxSensor(CoordinatorEntity, RoosterFamilyEntity, SensorEntity):
+    """Writes waiting to be sent to Rooster Money."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: RoosterCoordinator, account: FamilyAccount) -> None:
+        """Initialize the sensor."""
+        CoordinatorEntity.__init__(self, coordinator)
+        RoosterFamilyEntity.__init__(self, account, coordinator.rooster, "outbox")
+        self.coordinator: RoosterCoordinator = coordinator
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return len(self.coordinator.outbox.items)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return "Pending Changes"
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return "mdi:tray-full"
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes."""
         return {
-            "month_transactions": self._account.current_month_transactions,
-            "type": self._account.latest_transaction["type"],
-            "reason": self._account.latest_transaction["reason"],
+            "enabled": self.coordinator.outbox.enabled,
+            "items": [
+                {
+                    "id": item["id"],
+                    "operation": item["operation"],
+                    "child_id": item["child_id"],
+                    "created": item["created"],
+                    "attempts": item["attempts"],
+                }
+                for item in self.coordinator.outbox.items
+            ],
         }
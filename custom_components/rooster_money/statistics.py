@@ -0,0 +1,213 @@
+"""Long-term balance statistics for Rooster Money."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from pyroostermoney import RoosterMoney
+from pyroostermoney.child import ChildAccount
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .helpers import transaction_time
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+
+
+def child_statistic_id(child: ChildAccount) -> str:
+    """Return the statistic id for a child's pocket money balance."""
+    return f"{DOMAIN}:child_{child.user_id}_pocket_money"
+
+
+def pot_statistic_id(child: ChildAccount, pot_id: str) -> str:
+    """Return the statistic id for a pot balance."""
+    return f"{DOMAIN}:child_{child.user_id}_pot_{slugify(str(pot_id))}"
+
+
+def family_statistic_id(account_number: str) -> str:
+    """Return the statistic id for the family account balance."""
+    return f"{DOMAIN}:family_{slugify(str(account_number))}_balance"
+
+
+def build_hourly_statistics(
+    points: list[tuple[datetime, float]],
+    opening: float,
+    start: datetime,
+    end: datetime,
+) -> tuple[list[StatisticData], float]:
+    """Convert balance points into hourly rows between start and end.
+
+    Points must be sorted and in UTC, the opening value is the balance at start.
+    Returns the rows and the balance at the end of the last row.
+    """
+    statistics: list[StatisticData] = []
+    state = opening
+    idx = 0
+    hour = start
+    while hour < end:
+        next_hour = hour + HOUR
+        while idx < len(points) and points[idx][0] < hour:
+            idx += 1
+        low = high = state
+        weighted = 0.0
+        last_time = hour
+        while idx < len(points) and points[idx][0] < next_hour:
+            time, value = points[idx]
+            weighted += state * (time - last_time).total_seconds()
+            state, last_time = value, time
+            low, high = min(low, state), max(high, state)
+            idx += 1
+        weighted += state * (next_hour - last_time).total_seconds()
+        statistics.append(
+            StatisticData(
+                start=hour,
+                state=state,
+                min=low,
+                max=high,
+                mean=weighted / HOUR.total_seconds(),
+            )
+        )
+        hour = next_hour
+    return statistics, state
+
+
+class RoosterStatistics:
+    """Imports hourly balance statistics into the recorder."""
+
+    def __init__(self, hass: HomeAssistant, rooster: RoosterMoney) -> None:
+        """Init the statistics importer."""
+        self.hass = hass
+        self.rooster = rooster
+        self._last_hour: dict[str, datetime | None] = {}
+        self._last_state: dict[str, float] = {}
+        self._observations: dict[str, list[tuple[datetime, float]]] = {}
+
+    def _observe(self, statistic_id: str, value) -> None:
+        """Record the current value of a series."""
+        if value is None:
+            return
+        self._observations.setdefault(statistic_id, []).append(
+            (dt_util.utcnow(), float(value))
+        )
+
+    async def _async_load_last(self, statistic_id: str) -> None:
+        """Load the last imported hour of a series from the recorder."""
+        if statistic_id in self._last_hour:
+            return
+        last_stats = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"state"}
+        )
+        if last_stats.get(statistic_id):
+            last = last_stats[statistic_id][0]
+            self._last_hour[statistic_id] = dt_util.utc_from_timestamp(last["start"])
+            self._last_state[statistic_id] = float(last["state"])
+        else:
+            self._last_hour[statistic_id] = None
+
+    async def _async_import_series(
+        self,
+        statistic_id: str,
+        name: str,
+        unit: str | None,
+        history: list[tuple[datetime, float]] | None = None,
+        opening: float | None = None,
+    ) -> None:
+        """Import all completed hours of a series that are not yet recorded."""
+        await self._async_load_last(statistic_id)
+        points = sorted((history or []) + self._observations.get(statistic_id, []))
+        if not points:
+            return
+        end = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        last_hour = self._last_hour[statistic_id]
+        if last_hour is not None:
+            start = last_hour + HOUR
+            opening = self._last_state[statistic_id]
+        else:
+            start = points[0][0].replace(minute=0, second=0, microsecond=0)
+            if opening is None:
+                opening = points[0][1]
+        if start >= end:
+            return
+        statistics, state = build_hourly_statistics(points, opening, start, end)
+        # observations before the current hour are now part of the imported rows
+        self._observations[statistic_id] = [
+            point for point in self._observations.get(statistic_id, []) if point[0] >= end
+        ]
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=name,
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=unit,
+        )
+        async_add_external_statistics(self.hass, metadata, statistics)
+        self._last_hour[statistic_id] = statistics[-1]["start"]
+        self._last_state[statistic_id] = state
+        _LOGGER.debug("Imported %s statistics for %s", len(statistics), statistic_id)
+
+    @staticmethod
+    def _transaction_history(
+        child: ChildAccount,
+    ) -> tuple[list[tuple[datetime, float]], float | None]:
+        """Return the balance after each transaction and the balance before them."""
+        history = []
+        for transaction in child.transactions:
+            if transaction.new_balance is None:
+                continue
+            timestamp = transaction_time(transaction)
+            if timestamp is None:
+                continue
+            history.append(
+                (
+                    timestamp,
+                    float(transaction.new_balance),
+                    float(transaction.amount or 0),
+                )
+            )
+        if not history:
+            return [], None
+        history.sort()
+        opening = history[0][1] - history[0][2]
+        return [(time, balance) for time, balance, _ in history], opening
+
+    async def async_import(self) -> None:
+        """Import new balance statistics from the latest coordinator data."""
+        for child in self.rooster.children:
+            currency = str(child.currency).upper()
+            statistic_id = child_statistic_id(child)
+            history, opening = self._transaction_history(child)
+            self._observe(statistic_id, child.available_pocket_money)
+            await self._async_import_series(
+                statistic_id,
+                f"{child.first_name} Available Pocket Money",
+                currency,
+                history,
+                opening,
+            )
+            for pot in child.pots:
+                statistic_id = pot_statistic_id(child, pot.pot_id)
+                self._observe(statistic_id, pot.value)
+                await self._async_import_series(
+                    statistic_id, f"{child.first_name} {pot.name} Pot", currency
+                )
+
+        family_account = self.rooster.family_account
+        if family_account is not None:
+            statistic_id = family_statistic_id(family_account.account_number)
+            self._observe(statistic_id, family_account.balance)
+            await self._async_import_series(
+                statistic_id,
+                "Family Account Balance",
+                str(family_account.currency).upper(),
+            )
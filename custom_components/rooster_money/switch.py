@@ -6,11 +6,16 @@ from decimal import Decimal
 from typing import Any, Literal
 import logging
 from pyroostermoney import RoosterMoney
+from pyroostermoney.child import ChildAccount
+from pyroostermoney.family_account import FamilyAccount
 
 from homeassistant.components.switch import SwitchEntity, SwitchDeviceClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.typing import StateType, UndefinedType
 
 from .const import (
@@ -19,7 +24,9 @@ from .const import (
     CHILD_ACCOUNT_ATTR_MAP,
     ENTITY_SERVICES,
 )
+from .entity_factory import PlatformEntities
 from .rooster_base import RoosterChildEntity, RoosterFamilyEntity
+from .update_coordinator import RoosterCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,26 +37,37 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Rooster Money session."""
-    entities = []
-    for child in hass.data[DOMAIN][config_entry.entry_id].rooster.children:
-        entities.append(
-            RoosterCardEntity(
-                coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                idx=None,
-                child_id=child.user_id,
-                entity_id="card",
-            )
-        )
-        entities.append(
-            RoosterAllowanceEntity(
-                coordinator=hass.data[DOMAIN][config_entry.entry_id],
-                idx=None,
-                child_id=child.user_id,
-                entity_id="allowance",
-            )
-        )
-
-    async_add_entities(entities, True)
+    coordinator: RoosterCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator.entity_factory.async_add_platform(
+        Platform.SWITCH,
+        PlatformEntities(
+            async_add_entities, family=build_family_switches, child=build_child_switches
+        ),
+    )
+
+
+def build_child_switches(
+    coordinator: RoosterCoordinator, child: ChildAccount
+) -> list[SwitchEntity]:
+    """Build the switches of a child account."""
+    return [
+        RoosterCardEntity(
+            coordinator=coordinator, idx=None, child_id=child.user_id, entity_id="card"
+        ),
+        RoosterAllowanceEntity(
+            coordinator=coordinator,
+            idx=None,
+            child_id=child.user_id,
+            entity_id="allowance",
+        ),
+    ]
+
+
+def build_family_switches(
+    coordinator: RoosterCoordinator, family_account: FamilyAccount
+) -> list[SwitchEntity]:
+    """Build the switches of the family account."""
+    return [RoosterRecordTrafficEntity(coordinator, family_account)]
 
 
 class RoosterAllowanceEntity(RoosterChildEntity, SwitchEntity):
@@ -65,7 +83,17 @@ class RoosterAllowanceEntity(RoosterChildEntity, SwitchEntity):
 
     @property
     def is_on(self) -> bool:
-        return self._child.allowance
+        return self.coordinator.writes.override(
+            f"allowance_{self._child_id}", self._child.allowance
+        )
+
+    @property
+    def _allowance(self) -> dict[str, Any]:
+        """Returns the pending allowance, a toggle must not undo an amount change."""
+        return self.coordinator.writes.pending_params(
+            f"allowance_{self._child_id}",
+            {"paused": not self._child.allowance, "amount": self._child.allowance_amount},
+        )
 
     @property
     def device_class(self) -> SwitchDeviceClass | None:
@@ -74,21 +102,29 @@ class RoosterAllowanceEntity(RoosterChildEntity, SwitchEntity):
     @property
     def device_state_attributes(self) -> Mapping[str, Any] | None:
         return {
-            "amount": self._child.allowance_amount,
+            "amount": self._allowance["amount"],
             "day": self._child.allowance_day,
             "last_paid": self._child.allowance_last_paid,
         }
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable regular allowance."""
-        await self._child.update_allowance(
-            paused=False, amount=self._child.allowance_amount
+        await self.coordinator.writes.async_submit(
+            "update_allowance",
+            self._child_id,
+            {"paused": False, "amount": self._allowance["amount"]},
+            coalesce_key=f"allowance_{self._child_id}",
+            optimistic=True,
         )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Disable regular allowance."""
-        await self._child.update_allowance(
-            paused=True, amount=self._child.allowance_amount
+        await self.coordinator.writes.async_submit(
+            "update_allowance",
+            self._child_id,
+            {"paused": True, "amount": self._allowance["amount"]},
+            coalesce_key=f"allowance_{self._child_id}",
+            optimistic=False,
         )
 
 
@@ -101,7 +137,9 @@ class RoosterCardEntity(RoosterChildEntity, SwitchEntity):
 
     @property
     def is_on(self) -> bool:
-        return self._child.card.status == "active"
+        return self.coordinator.writes.override(
+            f"card_{self._child_id}", self._child.card.status == "active"
+        )
 
     @property
     def unique_id(self) -> str:
@@ -122,12 +160,71 @@ class RoosterCardEntity(RoosterChildEntity, SwitchEntity):
 
     @property
     def entity_picture(self) -> str | None:
-        return self._child.card.image
+        return self.coordinator.images.async_get_url(self._child.card.image)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable the card."""
-        await self._child.card.set_card_status(True)
+        await self.coordinator.writes.async_submit(
+            "set_card_status",
+            self._child_id,
+            {"active": True},
+            coalesce_key=f"card_{self._child_id}",
+            optimistic=True,
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Disable the card."""
-        await self._child.card.set_card_status(False)
+        await self.coordinator.writes.async_submit(
+            "set_card_status",
+            self._child_id,
+            {"active": False},
+            coalesce_key=f"card_{self._child_id}",
+            optimistic=False,
+        )
+
+
+class RoosterRecordTrafficEntity(CoordinatorEntity, RoosterFamilyEntity, SwitchEntity):
+    """Records redacted API traffic to a cassette for offline replay."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: RoosterCoordinator, account) -> None:
+        """Initialize the switch."""
+        CoordinatorEntity.__init__(self, coordinator)
+        RoosterFamilyEntity.__init__(
+            self, account, coordinator.rooster, "record_traffic"
+        )
+        self.coordinator: RoosterCoordinator = coordinator
+
+    @property
+    def name(self) -> str:
+        """Return the name of the switch."""
+        return "Record API Traffic"
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return "mdi:record-rec"
+
+    @property
+    def is_on(self) -> bool:
+        """Return if traffic is being recorded."""
+        return self.coordinator.cassette.enabled
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes."""
+        return {
+            "path": self.coordinator.cassette.path,
+            "recorded": self.coordinator.cassette.recorded,
+        }
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Start recording."""
+        await self.coordinator.cassette.async_set_enabled(True)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Stop recording."""
+        await self.coordinator.cassette.async_set_enabled(False)
+        self.async_write_ha_state()
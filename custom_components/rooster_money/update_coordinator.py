@@ -6,29 +6,165 @@ import async_timeout
 
 from homeassistant.core import HomeAssistant
 from pyroostermoney import RoosterMoney
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.util import dt as dt_util
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
+from .aggregates import RoosterAggregates
+from .analytics import RoosterAnalytics
+from .cassette import CassetteRecorder, cassette_path
+from .entity_factory import RoosterEntityFactory
+from .const import (
+    DEFAULT_UPDATE_INTERVAL,
+    REFRESH_TIMEOUT,
+    TARGETED_REFRESH_COOLDOWN,
+    TARGETED_REFRESH_RESOURCES,
+)
+from .images import RoosterImageCache
+from .job_history import RoosterJobHistory
+from .offload import RoosterOffload
+from .outbox import RoosterOutbox
+from .rate_limit import RequestBudgetExhausted, RoosterRateLimiter
+from .resilience import RoosterRequestPolicy
+from .statistics import RoosterStatistics
+from .writes import RoosterWritePipeline
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class RoosterCoordinator(DataUpdateCoordinator):
     """Custom update coordinator."""
 
-    def __init__(self, hass: HomeAssistant, rooster: RoosterMoney) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rooster: RoosterMoney,
+        update_interval: int = DEFAULT_UPDATE_INTERVAL,
+        daily_budget: int = 0,
+        queue_failed_writes: bool = False,
+        hedge_requests: bool = False,
+        job_history_days: int = 0,
+    ) -> None:
         """Init the coordinator."""
         super().__init__(
-            hass, _LOGGER, name="Rooster Money", update_interval=timedelta(seconds=60)
+            hass,
+            _LOGGER,
+            name="Rooster Money",
+            update_interval=timedelta(seconds=update_interval),
         )
         self.rooster = rooster
+        # RoosterMoney.create has already fetched everything once
+        self.last_refreshed = dt_util.utcnow()
+        self.cassette = CassetteRecorder(
+            hass,
+            rooster,
+            cassette_path(hass, self.config_entry.entry_id),
+        )
+        self.limiter = RoosterRateLimiter(daily_budget)
+        self.policy = RoosterRequestPolicy(hedge_requests)
+        # every pyroostermoney object shares the session, so this covers all calls,
+        # retries and hedges each take a token from the limiter
+        rooster.request_handler = self.policy.wrap(
+            rooster.request_handler, self.limiter.acquire
+        )
+        self.statistics = RoosterStatistics(hass, rooster)
+        self.analytics = RoosterAnalytics(hass, rooster, self.config_entry.entry_id)
+        self.aggregates = RoosterAggregates(rooster)
+        self.offload = RoosterOffload(hass, rooster)
+        self.job_history = RoosterJobHistory(
+            hass, rooster, self.config_entry.entry_id, job_history_days
+        )
+        self.outbox = RoosterOutbox(
+            hass,
+            rooster,
+            self.config_entry.entry_id,
+            queue_failed_writes,
+            self.async_request_refresh,
+        )
+        self.writes = RoosterWritePipeline(self.outbox, self.async_update_listeners)
+        self.images = RoosterImageCache(
+            hass, self.config_entry.entry_id, self.async_update_listeners
+        )
+        self.entity_factory = RoosterEntityFactory(hass, self)
+        self._pending_refresh: set[tuple[int, str]] = set()
+        self._targeted_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=TARGETED_REFRESH_COOLDOWN,
+            immediate=False,
+            function=self._async_targeted_refresh,
+        )
 
     async def _async_update_data(self):
         """Fetch data from the API."""
+        if not self.limiter.allow_poll():
+            _LOGGER.debug("Request budget low, skipping refresh")
+            return self.data
+        settled = self.writes.settled()
         try:
-            async with async_timeout.timeout(50):
+            async with async_timeout.timeout(REFRESH_TIMEOUT):
                 listening_idx = set(self.async_contexts())
-                return await self.rooster.update()
+                data = await self.rooster.update()
+        except RequestBudgetExhausted as err:
+            _LOGGER.debug("Skipping the rest of the refresh: %s", err)
+            return self.data
         except Exception as err:
             raise UpdateFailed from err
+        self.last_refreshed = dt_util.utcnow()
+        self.writes.async_reconcile(settled)
+        self.analytics.async_update()
+        self.aggregates.async_update()
+        self.job_history.async_update()
+        await self.offload.async_update()
+        # connectivity is back, no need to wait for the backoff
+        self.outbox.async_schedule_replay(0)
+        try:
+            await self.statistics.async_import()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unable to import balance statistics")
+        return data
+
+    async def async_ensure_fresh(self, max_age: timedelta):
+        """Refresh now if the cached data is older than max_age."""
+        if dt_util.utcnow() - self.last_refreshed > max_age:
+            await self.async_refresh()
+
+    async def async_request_targeted_refresh(self, child_id: int, resource: str):
+        """Request a debounced refresh of a single resource of a child."""
+        self._pending_refresh.add((child_id, resource))
+        await self._targeted_debouncer.async_call()
+
+    async def _async_targeted_refresh(self):
+        """Refresh only the resources that have been hinted as changed."""
+        pending, self._pending_refresh = self._pending_refresh, set()
+        settled = self.writes.settled()
+        for child_id, resource in pending:
+            _LOGGER.debug("Targeted refresh of %s for %s", resource, child_id)
+            try:
+                child = self.rooster.get_child_account(child_id)
+            except IndexError:
+                # the child was removed after the hint was accepted
+                _LOGGER.debug("Ignoring targeted refresh of unknown child %s", child_id)
+                continue
+            try:
+                await getattr(child, TARGETED_REFRESH_RESOURCES[resource])()
+            except RequestBudgetExhausted as err:
+                _LOGGER.debug("Skipping targeted refresh of %s: %s", resource, err)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Targeted refresh of %s failed", resource)
+        self.writes.async_reconcile(settled)
+        self.analytics.async_update()
+        self.aggregates.async_update()
+        self.job_history.async_update()
+        await self.offload.async_update()
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel any pending targeted refresh and outbox replay."""
+        await super().async_shutdown()
+        await self._targeted_debouncer.async_shutdown()
+        await self.outbox.async_shutdown()
+        await self.job_history.async_flush()
@@ -0,0 +1,127 @@
+"""Per-child write pipeline for Rooster Money."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+
+from .const import WRITE_COALESCE_WINDOW
+from .outbox import RoosterOutbox
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RoosterWritePipeline:
+    """Serialises writes per child and collapses rapid writes to the same field.
+
+    A write with a coalesce key is sent straight away. When a write for the same
+    key is still pending, the new one waits a short window behind it and only the
+    latest of those waiting is sent. Until a refresh that started after the write settled has
+    finished, entities read the written value so a stale refresh cannot make
+    them flap back.
+    """
+
+    def __init__(self, outbox: RoosterOutbox, on_change: Callable[[], None]) -> None:
+        """Init the pipeline."""
+        self.outbox = outbox
+        self._on_change = on_change
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._generation: dict[str, int] = {}
+        self._in_flight: set[str] = set()
+        self._overrides: dict[str, Any] = {}
+        # coalesce key -> params of the latest write not yet taken over by a refresh
+        self._params: dict[str, dict[str, Any]] = {}
+
+    def _lock(self, child_id: int) -> asyncio.Lock:
+        """Return the write lock of a child."""
+        if child_id not in self._locks:
+            self._locks[child_id] = asyncio.Lock()
+        return self._locks[child_id]
+
+    @callback
+    def override(self, coalesce_key: str, default: Any) -> Any:
+        """Return the pending value of a field, or the refreshed one."""
+        return self._overrides.get(coalesce_key, default)
+
+    @callback
+    def pending_params(
+        self, coalesce_key: str, default: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Return the params of the latest write to a target, or the refreshed ones.
+
+        Writes that share a coalesce key replace each other, so a write that
+        changes one field must carry the pending values of the others.
+        """
+        if coalesce_key in self._params:
+            return self._params[coalesce_key]
+        for item in reversed(self.outbox.items):
+            if item["coalesce_key"] == coalesce_key:
+                return item["params"]
+        return default
+
+    @callback
+    def settled(self) -> set[str]:
+        """Return the fields that have no write pending, taken when a refresh starts."""
+        queued = {item["coalesce_key"] for item in self.outbox.items}
+        return {
+            key
+            for key in self._overrides.keys() | self._params.keys()
+            if key not in self._in_flight and key not in queued
+        }
+
+    @callback
+    def async_reconcile(self, settled: set[str]) -> None:
+        """Let a finished refresh take over the fields that settled before it began."""
+        for key in settled:
+            self._overrides.pop(key, None)
+            self._params.pop(key, None)
+
+    async def async_submit(
+        self,
+        operation: str,
+        child_id: int,
+        params: dict[str, Any],
+        coalesce_key: str | None = None,
+        optimistic: Any = None,
+    ) -> bool:
+        """Send a write through the outbox.
+
+        Returns True if the write was sent or superseded, False if it was queued.
+        """
+        if coalesce_key is None:
+            async with self._lock(child_id):
+                return await self.outbox.async_submit(operation, child_id, params)
+
+        generation = self._generation.get(coalesce_key, 0) + 1
+        self._generation[coalesce_key] = generation
+        pending = coalesce_key in self._in_flight
+        self._in_flight.add(coalesce_key)
+        self._params[coalesce_key] = params
+        if optimistic is not None:
+            self._overrides[coalesce_key] = optimistic
+            self._on_change()
+        if pending:
+            # give further toggles a chance to replace this one while we wait
+            await asyncio.sleep(WRITE_COALESCE_WINDOW)
+            if self._generation[coalesce_key] != generation:
+                _LOGGER.debug("Dropping %s, superseded by a later write", coalesce_key)
+                return True
+        try:
+            async with self._lock(child_id):
+                if self._generation[coalesce_key] != generation:
+                    return True
+                return await self.outbox.async_submit(
+                    operation, child_id, params, coalesce_key
+                )
+        except Exception:
+            if self._generation[coalesce_key] == generation:
+                self._overrides.pop(coalesce_key, None)
+                self._params.pop(coalesce_key, None)
+                self._on_change()
+            raise
+        finally:
+            if self._generation[coalesce_key] == generation:
+                self._in_flight.discard(coalesce_key)
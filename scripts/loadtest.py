@@ -0,0 +1,756 @@
+#!/usr/bin/env python3
+"""Load test the Rooster Money integration against a fake API.
+
+Home Assistant is started in a temporary config directory with the integration
+set up against a replayed cassette, either one recorded with the Record API
+Traffic switch or one generated for a synthetic household. Entity services,
+coordinator refreshes and calendar queries are then fired at fixed rates while
+event loop lag, latency percentiles, upstream requests per operation and memory
+are measured.
+"""
+# ruff: noqa: T201
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+import contextlib
+import contextvars
+import functools
+from datetime import date, datetime, timedelta
+import json
+import logging
+import os
+import random
+import re
+import resource
+import socket
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAIN = "rooster_money"
+ENDPOINT_RE = re.compile(r"\d+")
+WRITE_OPERATIONS = {"boost_pot", "perform_action_on_job", "create_standing_order"}
+
+_LOGGER = logging.getLogger("loadtest")
+
+# the operation that caused an upstream request, background for timers
+current_operation: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_operation", default="background"
+)
+
+
+def synthetic_cassette(
+    path: str,
+    children: int,
+    jobs: int,
+    pots: int,
+    transactions: int,
+    latency: float,
+) -> None:
+    """Write a cassette for a household of the given size."""
+    today = date.today()
+    period_start = today - timedelta(days=today.weekday())
+    entries = []
+
+    def add(url: str, response) -> None:
+        entries.append(
+            {
+                "method": "GET",
+                "url": url,
+                "status": 200,
+                "response": response,
+                "duration": latency,
+            }
+        )
+
+    child_ids = [1000 + idx for idx in range(children)]
+    add(
+        "api/parent",
+        {
+            "userId": 1,
+            "familyId": 1,
+            "familyLedgerBalance": 1000000,
+            "children": [{"userId": user_id} for user_id in child_ids],
+        },
+    )
+    add(
+        "api/parent/family/account",
+        {
+            "accountNumber": "00000000",
+            "sortCode": "000000",
+            "suggestedMonthlyTransfer": {
+                "precision": 2,
+                "amount": 1000,
+                "currency": "GBP",
+            },
+        },
+    )
+    add(
+        f"api/parent/family/statement/{today.year}/{today.month}",
+        [
+            {
+                "reason": f"Transfer {idx}",
+                "transactionType": "TRANSFER",
+                "creditAmount": {"amount": 500 if idx % 2 else 0},
+                "debitAmount": {"amount": 0 if idx % 2 else 250},
+            }
+            for idx in range(transactions)
+        ],
+    )
+    add(
+        "api/parent/family/cards",
+        [
+            {
+                "childId": user_id,
+                "cardId": f"card{user_id}",
+                "sca": {
+                    "count": 0,
+                    "countLimit": 5,
+                    "spendLimit": {"amount": 13500},
+                    "totalSpend": {"amount": 0},
+                },
+            }
+            for user_id in child_ids
+        ],
+    )
+    add(
+        "api/parent/master-jobs",
+        {
+            "masterJobs": [
+                {
+                    "masterJobId": idx + 1,
+                    "title": f"Job {idx + 1}",
+                    "rewardAmount": 0.5,
+                    "dueAnyDay": False,
+                    "scheduledJobId": 0,
+                    "dueDate": period_start.isoformat(),
+                    "timeOfDay": 12,
+                    "childUserIds": child_ids,
+                    "scheduleInfo": {"daysOfTheWeek": [idx % 7 + 1]},
+                }
+                for idx in range(jobs)
+            ]
+        },
+    )
+    for number, user_id in enumerate(child_ids):
+        add(
+            f"api/parent/child/{user_id}",
+            {
+                "interestRate": 0,
+                "availablePocketMoney": 10.0,
+                "currency": "GBP",
+                "firstName": f"Child{number + 1}",
+                "surname": "Loadtest",
+                "gender": 1,
+                "realMoneyStatus": 1,
+                "profileImageUrl": None,
+                "locked": False,
+                "pocketMoneyAmount": 5.0,
+                "pocketMoneyDayRaw": 4,
+                "pocketMoneyLastPaid": None,
+            },
+        )
+        add(
+            f"api/parent/child/{user_id}/pocketmoney",
+            {
+                "potSettings": {
+                    pot: {"display": True}
+                    for pot in ("savePot", "goalPot", "spendPot", "givePot")
+                },
+                "safeTotal": 5.0,
+                "saveGoalAmount": 20.0,
+                "allocatedToGoals": 0,
+                "walletTotal": 10.0,
+                "giveAmount": 1.0,
+                "customPots": [
+                    {
+                        "customPotId": f"pot{user_id}_{idx}",
+                        "customLedgerMetadata": {
+                            "title": f"Pot {idx + 1}",
+                            "imageUrl": None,
+                            "upperLimit": {"amount": 50},
+                        },
+                        "availableBalance": {"amount": 10},
+                        "updated": datetime.now().isoformat(),
+                    }
+                    for idx in range(pots)
+                ],
+            },
+        )
+        add(
+            f"api/parent/child/{user_id}/card/details",
+            {
+                "image": {"maskedPan": "**** 0000", "expDate": "01/30"},
+                "name": f"Child{number + 1}",
+                "cardTemplate": {
+                    "imageUrl": None,
+                    "title": "Card",
+                    "description": "",
+                    "category": "card",
+                },
+                "status": "active",
+            },
+        )
+        add(
+            f"api/parent/child/{user_id}/standingorder",
+            [
+                {
+                    "amount": 1.0,
+                    "day": "Friday",
+                    "frequency": "Weekly",
+                    "id": f"regular{user_id}",
+                    "paused": False,
+                    "tag": "",
+                    "title": "Savings",
+                }
+            ],
+        )
+        add(
+            f"api/parent/child/{user_id}/allowance-periods",
+            [
+                {
+                    "allowancePeriodId": user_id,
+                    "startDate": period_start.isoformat(),
+                    "endDate": (period_start + timedelta(days=6)).isoformat(),
+                }
+            ],
+        )
+        add(
+            f"api/parent/child/{user_id}/allowance-periods/{user_id}/jobs",
+            {
+                "jobs": [
+                    {
+                        "allowancePeriodId": user_id,
+                        "masterJobId": idx + 1,
+                        "scheduledJobId": user_id * 10000 + idx,
+                        "title": f"Job {idx + 1}",
+                        "rewardAmount": 0.5,
+                        "dueAnyDay": False,
+                        "dueDate": (period_start + timedelta(days=idx % 7)).isoformat(),
+                        "timeOfDay": 12,
+                        "state": (1, 2, 3, 5)[idx % 4],
+                    }
+                    for idx in range(jobs)
+                ]
+            },
+        )
+        add(
+            f"api/parent/child/{user_id}/spendHistory?count=10",
+            [
+                {
+                    "id": user_id * 100 + idx,
+                    "amount": -0.5 if idx % 3 else 5.0,
+                    "balance": 10.0,
+                    "currency": "GBP",
+                    "description": "Load test",
+                    "time": (datetime.now() - timedelta(days=10 - idx)).isoformat(),
+                    "type": "SPEND" if idx % 3 else "POCKET_MONEY",
+                    "userId": user_id,
+                }
+                for idx in range(10)
+            ],
+        )
+
+    with open(path, "w", encoding="utf-8") as cassette:
+        cassette.writelines(f"{json.dumps(entry)}\n" for entry in entries)
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes() -> int:
+    """Return the resident set size, or the peak where that is unavailable."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Return the usual latency percentiles in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50": pick(0.5),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+class Metrics:
+    """Everything measured during a run."""
+
+    def __init__(self) -> None:
+        """Init the metrics."""
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter] = defaultdict(Counter)
+        self.dropped: Counter = Counter()
+        self.cancelled: Counter = Counter()
+        self.upstream: dict[str, Counter] = defaultdict(Counter)
+        self.loop_lag: list[float] = []
+        self.memory: list[tuple[float, int]] = []
+
+    def report(self, duration: float) -> dict:
+        """Return the results of a run."""
+        return {
+            "duration": round(duration, 1),
+            "loop_lag_ms": percentiles(self.loop_lag),
+            "operations": {
+                name: {
+                    **percentiles(values),
+                    "errors": dict(self.errors.get(name, {})),
+                    "dropped": self.dropped.get(name, 0),
+                    "cancelled": self.cancelled.get(name, 0),
+                }
+                for name, values in sorted(self.latency.items())
+            }
+            | {
+                name: {
+                    "errors": dict(self.errors.get(name, {})),
+                    "dropped": self.dropped.get(name, 0),
+                    "cancelled": self.cancelled.get(name, 0),
+                }
+                for name in self.errors.keys() | self.cancelled.keys()
+                if name not in self.latency
+            },
+            "upstream_requests": {
+                name: dict(counts.most_common())
+                for name, counts in sorted(self.upstream.items())
+            },
+            "memory": {
+                "rss_start_mb": round(self.memory[0][1] / 2**20, 1),
+                "rss_end_mb": round(self.memory[-1][1] / 2**20, 1),
+                "rss_max_mb": round(max(rss for _, rss in self.memory) / 2**20, 1),
+                "samples": [
+                    [round(elapsed, 1), round(rss / 2**20, 1)]
+                    for elapsed, rss in self.memory
+                ],
+            }
+            if self.memory
+            else {},
+        }
+
+
+async def monitor_loop_lag(metrics: Metrics, interval: float, stop: asyncio.Event):
+    """Measure how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        metrics.loop_lag.append(max(0.0, loop.time() - expected))
+
+
+async def monitor_memory(metrics: Metrics, interval: float, stop: asyncio.Event):
+    """Sample the resident set size."""
+    started = time.monotonic()
+    while not stop.is_set():
+        metrics.memory.append((time.monotonic() - started, rss_bytes()))
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), interval)
+    metrics.memory.append((time.monotonic() - started, rss_bytes()))
+
+
+async def run_at_rate(
+    name: str,
+    rate: float,
+    operation: Callable[[], Awaitable],
+    metrics: Metrics,
+    in_flight: asyncio.Semaphore,
+    stop: asyncio.Event,
+    drain: float,
+) -> None:
+    """Start an operation rate times per second until stopped.
+
+    Operations still running drain seconds after the stop are cancelled.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def timed() -> None:
+        current_operation.set(name)
+        started = time.perf_counter()
+        try:
+            await operation()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("%s failed", name, exc_info=True)
+            metrics.errors[name][type(err).__name__] += 1
+        else:
+            metrics.latency[name].append(time.perf_counter() - started)
+        finally:
+            in_flight.release()
+
+    tasks: set[asyncio.Task] = set()
+    next_start = loop.time()
+    while not stop.is_set():
+        if in_flight.locked():
+            metrics.dropped[name] += 1
+        else:
+            await in_flight.acquire()
+            task = asyncio.create_task(timed())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        next_start += 1 / rate
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), max(0, next_start - loop.time()))
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(set(tasks), timeout=drain)
+    for task in pending:
+        task.cancel()
+    metrics.cancelled[name] += len(pending)
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+def runs_integration(task: asyncio.Task) -> bool:
+    """Return True if a task runs a coroutine of the integration."""
+    code = getattr(task.get_coro(), "cr_code", None)
+    return code is not None and f"custom_components{os.sep}{DOMAIN}" in code.co_filename
+
+
+def attribute_refreshes(function: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+    """Count the requests of a refresh apart from the operation that caused it."""
+
+    @functools.wraps(function)
+    async def attributed():
+        trigger = current_operation.get()
+        if trigger == "background":
+            label = "scheduled refresh"
+        elif trigger == "refresh":
+            label = "refresh"
+        else:
+            label = f"refresh after {trigger}"
+        token = current_operation.set(label)
+        try:
+            return await function()
+        finally:
+            current_operation.reset(token)
+
+    return attributed
+
+
+async def async_start_hass(config_dir: str, cassette: str, args: argparse.Namespace):
+    """Start Home Assistant with the integration replaying a cassette."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import bootstrap, core
+    from homeassistant.config_entries import SOURCE_USER, ConfigEntry, ConfigEntryState
+
+    hass = core.HomeAssistant()
+    hass.config.config_dir = config_dir
+    hass.config.skip_pip = True
+    await bootstrap.async_from_config_dict(
+        {
+            "homeassistant": {"time_zone": "UTC"},
+            "http": {"server_host": "127.0.0.1", "server_port": free_port()},
+            "recorder": {"db_url": f"sqlite:///{config_dir}/loadtest.db"},
+        },
+        hass,
+    )
+    await hass.async_start()
+    entry = ConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="Load test",
+        data={
+            "username": "loadtest",
+            "password": "",
+            "update_interval": args.update_interval,
+            "replay_cassette": cassette,
+            "replay_speed": args.speed,
+            "replay_accept_writes": True,
+        },
+        source=SOURCE_USER,
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    if entry.state is not ConfigEntryState.LOADED:
+        await hass.async_stop()
+        raise SystemExit(f"Unable to set up {DOMAIN}: {entry.state}")
+    return hass, entry
+
+
+async def async_run(args: argparse.Namespace) -> dict:
+    """Run the load test and return the report."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import entity_registry as er
+
+    with tempfile.TemporaryDirectory(prefix="rooster_loadtest_") as config_dir:
+        os.symlink(
+            os.path.join(ROOT, "custom_components"),
+            os.path.join(config_dir, "custom_components"),
+        )
+        cassette = args.cassette and os.path.abspath(args.cassette)
+        if not cassette:
+            cassette = os.path.join(config_dir, "synthetic.cassette.jsonl")
+            synthetic_cassette(
+                cassette,
+                args.children,
+                args.jobs,
+                args.pots,
+                args.transactions,
+                args.latency,
+            )
+
+        hass, entry = await async_start_hass(config_dir, cassette, args)
+        try:
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            rooster = coordinator.rooster
+            metrics = Metrics()
+            if args.request_rate:
+                # lift the production token bucket to find the integration's own limits
+                coordinator.limiter.rate = args.request_rate
+                coordinator.limiter.capacity = max(
+                    coordinator.limiter.capacity, int(args.request_rate)
+                )
+
+            request_handler = rooster.request_handler
+
+            async def counting_request_handler(*handler_args, **handler_kwargs):
+                url = handler_kwargs.get("url", handler_args[0] if handler_args else "")
+                method = str(handler_kwargs.get("method", "GET")).upper()
+                endpoint = ENDPOINT_RE.sub("{id}", url.split("?")[0])
+                operation = current_operation.get()
+                if method == "GET" and operation in WRITE_OPERATIONS:
+                    # pyroostermoney re-reads the child after some writes
+                    operation = f"refresh after {operation}"
+                metrics.upstream[operation][f"{method} {endpoint}"] += 1
+                return await request_handler(*handler_args, **handler_kwargs)
+
+            rooster.request_handler = counting_request_handler
+            # refreshes requested by a service run inside the service call
+            coordinator._async_update_data = attribute_refreshes(  # pylint: disable=protected-access
+                coordinator._async_update_data  # pylint: disable=protected-access
+            )
+            debouncer = coordinator._targeted_debouncer  # pylint: disable=protected-access
+            debouncer.function = attribute_refreshes(debouncer.function)
+
+            registry_entries = er.async_entries_for_config_entry(
+                er.async_get(hass), entry.entry_id
+            )
+            pot_entities = [
+                entity.entity_id
+                for entity in registry_entries
+                if entity.unique_id.endswith("_pot")
+            ]
+            child_entities = {
+                child.user_id: er.async_get(hass).async_get_entity_id(
+                    "sensor", DOMAIN, f"roostermoney_{child.user_id}_pocket_money"
+                )
+                for child in rooster.children
+            }
+            calendars = [
+                hass.data["calendar"].get_entity(entity.entity_id)
+                for entity in registry_entries
+                if entity.domain == "calendar"
+            ]
+
+            async def boost_pot():
+                await hass.services.async_call(
+                    DOMAIN,
+                    "boost_pot",
+                    {
+                        "entity_id": random.choice(pot_entities),
+                        "amount": 0.01,
+                        "description": "Load test",
+                    },
+                    blocking=True,
+                )
+
+            async def perform_action_on_job():
+                child = random.choice(rooster.children)
+                await hass.services.async_call(
+                    DOMAIN,
+                    "perform_action_on_job",
+                    {
+                        "entity_id": child_entities[child.user_id],
+                        "job_id": random.choice(child.jobs).scheduled_job_id,
+                        "action": "APPROVE",
+                    },
+                    blocking=True,
+                )
+
+            async def create_standing_order():
+                await hass.services.async_call(
+                    DOMAIN,
+                    "create_standing_order",
+                    {
+                        "entity_id": random.choice(list(child_entities.values())),
+                        "amount": 1.0,
+                        "day": "Monday",
+                        "frequency": "Weekly",
+                        "tag": "loadtest",
+                        "title": "Load test",
+                    },
+                    blocking=True,
+                )
+
+            async def calendar_query():
+                now = datetime.now().astimezone()
+                await random.choice(calendars).async_get_events(
+                    hass, now, now + timedelta(days=args.calendar_days)
+                )
+
+            workload = {
+                "boost_pot": (args.boost_pot_rate, boost_pot, pot_entities),
+                "perform_action_on_job": (
+                    args.job_action_rate,
+                    perform_action_on_job,
+                    [job for child in rooster.children for job in child.jobs],
+                ),
+                "create_standing_order": (
+                    args.standing_order_rate,
+                    create_standing_order,
+                    child_entities,
+                ),
+                "refresh": (args.refresh_rate, coordinator.async_refresh, [True]),
+                "calendar": (args.calendar_rate, calendar_query, calendars),
+            }
+
+            stop = asyncio.Event()
+            in_flight = asyncio.Semaphore(args.max_in_flight)
+            if args.tracemalloc:
+                tracemalloc.start(10)
+                baseline = tracemalloc.take_snapshot()
+            monitors = [
+                asyncio.create_task(monitor_loop_lag(metrics, args.lag_interval, stop)),
+                asyncio.create_task(monitor_memory(metrics, args.memory_interval, stop)),
+            ]
+            runners = [
+                asyncio.create_task(
+                    run_at_rate(
+                        name, rate, operation, metrics, in_flight, stop, args.drain
+                    )
+                )
+                for name, (rate, operation, targets) in workload.items()
+                if rate > 0 and targets
+            ]
+            started = time.monotonic()
+            await asyncio.sleep(args.duration)
+            stop.set()
+            await asyncio.gather(*runners, *monitors)
+            report = metrics.report(time.monotonic() - started)
+            report["household"] = {
+                "children": len(rooster.children),
+                "jobs": sum(len(child.jobs) for child in rooster.children),
+                "pots": len(pot_entities),
+                "entities": len(registry_entries),
+            }
+            report["rate_limiter"] = coordinator.limiter.as_dict()
+            report["request_policy"] = {
+                "retried": coordinator.policy.retried,
+                "hedged": coordinator.policy.hedged,
+            }
+            report["offload"] = coordinator.offload.as_dict()
+            if args.tracemalloc:
+                report["allocation_growth"] = [
+                    str(stat)
+                    for stat in tracemalloc.take_snapshot().compare_to(baseline, "lineno")[:10]
+                ]
+                tracemalloc.stop()
+            return report
+        finally:
+            await coordinator.async_shutdown()
+            # service calls run in shielded tasks that outlive the cancelled caller
+            leftover = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task() and runs_integration(task)
+            ]
+            for task in leftover:
+                task.cancel()
+            await asyncio.gather(*leftover, return_exceptions=True)
+            await hass.async_stop()
+
+
+def print_report(report: dict) -> None:
+    """Print a short summary of a report."""
+    print(f"Household: {report['household']}")
+    print(f"Event loop lag (ms): {report['loop_lag_ms']}")
+    print(f"Rate limiter: {report['rate_limiter']}")
+    print(f"Offload: {report['offload']}")
+    print(f"{'operation':<24}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  errors")
+    for name, result in report["operations"].items():
+        print(
+            f"{name:<24}{result.get('count', 0):>8}"
+            f"{result.get('p50', '-'):>10}{result.get('p95', '-'):>10}"
+            f"{result.get('p99', '-'):>10}{result.get('max', '-'):>10}"
+            f"  {result['errors'] or ''}"
+            f"{' dropped ' + str(result['dropped']) if result['dropped'] else ''}"
+            f"{' cancelled ' + str(result['cancelled']) if result['cancelled'] else ''}"
+        )
+    print("Upstream requests:")
+    for name, counts in report["upstream_requests"].items():
+        print(f"  {name}: {sum(counts.values())}")
+        for endpoint, count in counts.items():
+            print(f"    {count:>6}  {endpoint}")
+    memory = report["memory"]
+    print(
+        f"RSS (MB): start {memory['rss_start_mb']}, end {memory['rss_end_mb']}, "
+        f"max {memory['rss_max_mb']}"
+    )
+    for line in report.get("allocation_growth", []):
+        print(f"  {line}")
+
+
+def main() -> None:
+    """Parse the arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cassette", help="recorded cassette, default is synthetic")
+    parser.add_argument("--children", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=20, help="jobs per child")
+    parser.add_argument("--pots", type=int, default=2, help="custom pots per child")
+    parser.add_argument(
+        "--transactions", type=int, default=50, help="family transactions"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="synthetic response time (s)"
+    )
+    parser.add_argument("--speed", type=float, default=1.0, help="0 disables delays")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--update-interval", type=int, default=60)
+    parser.add_argument("--boost-pot-rate", type=float, default=0.2, help="per second")
+    parser.add_argument("--job-action-rate", type=float, default=0.02)
+    parser.add_argument("--standing-order-rate", type=float, default=0.02)
+    parser.add_argument("--refresh-rate", type=float, default=0.02)
+    parser.add_argument("--calendar-rate", type=float, default=5)
+    parser.add_argument("--calendar-days", type=int, default=30)
+    parser.add_argument(
+        "--request-rate",
+        type=float,
+        help="override the upstream token bucket rate (requests per second)",
+    )
+    parser.add_argument("--max-in-flight", type=int, default=100)
+    parser.add_argument(
+        "--drain", type=float, default=30, help="seconds before running operations are cancelled"
+    )
+    parser.add_argument("--lag-interval", type=float, default=0.05)
+    parser.add_argument("--memory-interval", type=float, default=5)
+    parser.add_argument("--tracemalloc", action="store_true")
+    parser.add_argument("--report", help="write the full report as JSON")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    report = asyncio.run(async_run(args))
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the Natwest Rooster Money integration."""
@@ -0,0 +1,63 @@
+"""Tests for the job boards."""
+from types import SimpleNamespace
+
+from pyroostermoney.enum import JobState
+
+from custom_components.rooster_money.aggregates import JobBoard
+
+
+def job(job_id: int, state: JobState, reward: float = 1.0) -> SimpleNamespace:
+    """Return a job in a state."""
+    return SimpleNamespace(scheduled_job_id=job_id, state=state, reward_amount=reward)
+
+
+def test_board_counts_a_snapshot() -> None:
+    """Jobs are counted per column, pending jobs add to the reward."""
+    board = JobBoard()
+    assert board.apply(
+        [
+            job(1, JobState.TODO, 1.5),
+            job(2, JobState.AWAITING_APPROVAL, 2.0),
+            job(3, JobState.APPROVED, 4.0),
+            job(4, JobState.SKIPPED),
+        ]
+    )
+    assert board.counts == {
+        "todo": 1,
+        "awaiting_approval": 1,
+        "approved": 1,
+        "expired": 1,
+    }
+    assert board.pending_reward == 3.5
+
+
+def test_board_applies_deltas() -> None:
+    """Only jobs that changed move a counter."""
+    board = JobBoard()
+    board.apply([job(1, JobState.TODO, 1.5), job(2, JobState.TODO, 2.0)])
+
+    assert not board.apply([job(1, JobState.TODO, 1.5), job(2, JobState.TODO, 2.0)])
+    assert board.apply([job(1, JobState.APPROVED, 1.5), job(2, JobState.TODO, 2.0)])
+    assert board.counts["todo"] == 1
+    assert board.counts["approved"] == 1
+    assert board.pending_reward == 2.0
+
+
+def test_board_drops_removed_jobs() -> None:
+    """Jobs missing from a snapshot leave the board, an empty board has no reward."""
+    board = JobBoard()
+    board.apply([job(1, JobState.TODO, 0.1), job(2, JobState.TODO, 0.2)])
+    board.apply([job(2, JobState.TODO, 0.2)])
+    assert board.counts["todo"] == 1
+
+    assert board.apply([])
+    assert board.counts == dict.fromkeys(board.counts, 0)
+    assert board.pending_reward == 0.0
+
+
+def test_board_ignores_states_without_a_column() -> None:
+    """Paused jobs are tracked without being counted."""
+    board = JobBoard()
+    assert board.apply([job(1, JobState.PAUSED)])
+    assert sum(board.counts.values()) == 0
+    assert board.pending_reward == 0.0
@@ -0,0 +1,77 @@
+"""Tests for the running spending and savings analytics."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.rooster_money.analytics import ChildAnalytics, RollingWindow
+from homeassistant.util import dt as dt_util
+
+NOW = datetime(2023, 9, 1, 12, tzinfo=timezone.utc)
+
+
+def test_rolling_window_expires_amounts() -> None:
+    """Amounts leave the total and the type breakdown once they are too old."""
+    window = RollingWindow(7)
+    window.add(NOW - timedelta(days=8), 2.0, "PURCHASE")
+    window.add(NOW - timedelta(days=1), 3.0, "PURCHASE")
+    window.add(NOW, 1.5, "TRANSFER")
+    assert window.total == 6.5
+
+    window.expire(NOW)
+
+    assert window.total == 4.5
+    assert window.by_type == {"PURCHASE": 3.0, "TRANSFER": 1.5}
+
+
+def test_rolling_window_expires_zero_amounts() -> None:
+    """A type whose amounts round to nothing is dropped without a KeyError."""
+    window = RollingWindow(7)
+    window.add(NOW - timedelta(days=9), 0.0, "PURCHASE")
+    window.add(NOW - timedelta(days=8), 0.0, "PURCHASE")
+
+    window.expire(NOW)
+
+    assert window.total == 0.0
+    assert window.by_type == {}
+
+
+def test_average_weekly_allowance_covers_ingested_history() -> None:
+    """The average is taken over the history counted, not since install."""
+    analytics = ChildAnalytics()
+    now = dt_util.utcnow()
+    for days in (28, 21, 14, 7, 0):
+        analytics.add(now - timedelta(days=days), f"t{days}", 5.0, "POCKET_MONEY")
+
+    assert analytics.since == now - timedelta(days=28)
+    assert round(analytics.average_weekly_allowance, 2) == 6.25
+
+
+def test_average_weekly_allowance_without_transactions() -> None:
+    """A child without transactions averages nothing."""
+    assert ChildAnalytics().average_weekly_allowance == 0.0
+
+
+def test_expired_transactions_are_not_counted_again() -> None:
+    """Transactions older than the newest one counted are ignored after expiry."""
+    analytics = ChildAnalytics()
+    transactions = [
+        (NOW - timedelta(days=2), "a", -4.0, "PURCHASE"),
+        (NOW - timedelta(days=1), "b", 10.0, "POCKET_MONEY"),
+    ]
+    assert [analytics.add(*transaction) for transaction in transactions] == [True, True]
+    assert analytics.spend_7d.total == 4.0
+    assert analytics.allowance_30d.total == 10.0
+
+    analytics.expire(NOW + timedelta(days=40))
+
+    assert analytics.spend_30d.total == 0.0
+    assert [analytics.add(*transaction) for transaction in transactions] == [False, False]
+    restored = ChildAnalytics.from_dict(analytics.as_dict())
+    assert [restored.add(*transaction) for transaction in transactions] == [False, False]
+
+
+def test_transactions_at_the_latest_time_are_counted_once() -> None:
+    """Different transactions sharing the newest timestamp are each counted once."""
+    analytics = ChildAnalytics()
+    assert analytics.add(NOW, "a", -1.0, "PURCHASE")
+    assert analytics.add(NOW, "b", -2.0, "PURCHASE")
+    assert not analytics.add(NOW, "a", -1.0, "PURCHASE")
+    assert analytics.spend_7d.total == 3.0
@@ -0,0 +1,107 @@
+"""Tests for the payout calendar index."""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from dateutil import rrule as RR
+
+from custom_components.rooster_money.calendar import ChildPayoutCalendar, payout_rule
+
+TODAY = date(2023, 9, 1)  # a Friday
+
+
+def make_calendar(**child) -> ChildPayoutCalendar:
+    """Return a payout calendar of a single child."""
+    child = SimpleNamespace(
+        **{
+            "user_id": 1,
+            "allowance": True,
+            "allowance_amount": 5,
+            "allowance_day": "MONDAY",
+            "available_pocket_money": 10,
+            "currency": "gbp",
+            "standing_orders": [],
+            **child,
+        }
+    )
+    coordinator = SimpleNamespace(
+        rooster=SimpleNamespace(children=[child]), last_update_success=True
+    )
+    return ChildPayoutCalendar(coordinator, None, 1, "payouts")
+
+
+def get_events(calendar: ChildPayoutCalendar, start: datetime, end: datetime):
+    """Return the events of a range, with today fixed."""
+    now = datetime.combine(TODAY, datetime.min.time(), timezone.utc)
+    with patch("homeassistant.util.dt.now", return_value=now):
+        return asyncio.run(calendar.async_get_events(None, start, end))
+
+
+def test_payout_rules() -> None:
+    """Supported frequencies project, unknown ones do not."""
+    until = TODAY + timedelta(days=50)
+    weekly = list(payout_rule("WEEKLY", "MONDAY", TODAY, until))
+    assert weekly[0].date() == date(2023, 9, 4)
+    assert {occurrence.weekday() for occurrence in weekly} == {RR.MO.weekday}
+    monthly = list(payout_rule("monthly", "15", TODAY, until))
+    assert [occurrence.date() for occurrence in monthly] == [
+        date(2023, 9, 15),
+        date(2023, 10, 15),
+    ]
+    assert len(list(payout_rule("DAILY", None, TODAY, until))) == 51
+    assert payout_rule("FORTNIGHTLY", "MONDAY", TODAY, until) is None
+
+
+def test_events_include_the_last_day_of_the_range() -> None:
+    """A payout on the last day is returned unless the range ends at its midnight."""
+    calendar = make_calendar()
+    start = datetime(2023, 9, 2, tzinfo=timezone.utc)
+
+    events = get_events(calendar, start, datetime(2023, 9, 4, 12, tzinfo=timezone.utc))
+    assert [event.start for event in events] == [date(2023, 9, 4)]
+
+    events = get_events(calendar, start, datetime(2023, 9, 4, tzinfo=timezone.utc))
+    assert events == []
+
+
+def test_events_project_the_balance() -> None:
+    """Payouts are ordered by day and add up on top of the balance."""
+    standing_order = SimpleNamespace(
+        regular_id=7,
+        amount=2,
+        day="WEDNESDAY",
+        frequency="WEEKLY",
+        title="Savings",
+        active=True,
+    )
+    calendar = make_calendar(standing_orders=[standing_order])
+    events = get_events(
+        calendar,
+        datetime(2023, 9, 1, tzinfo=timezone.utc),
+        datetime(2023, 9, 8, tzinfo=timezone.utc),
+    )
+    assert [(event.start, event.summary) for event in events] == [
+        (date(2023, 9, 4), "Pocket Money 5.00 GBP"),
+        (date(2023, 9, 6), "Savings 2.00 GBP"),
+    ]
+    assert events[-1].description == "Projected balance 17.00 GBP"
+
+
+def test_unsupported_standing_orders_are_skipped() -> None:
+    """A standing order that cannot be projected does not break the index."""
+    standing_order = SimpleNamespace(
+        regular_id=8,
+        amount=1,
+        day="MONDAY",
+        frequency="FORTNIGHTLY",
+        title="Odd",
+        active=True,
+    )
+    calendar = make_calendar(allowance=False, standing_orders=[standing_order])
+    events = get_events(
+        calendar,
+        datetime(2023, 9, 1, tzinfo=timezone.utc),
+        datetime(2023, 10, 1, tzinfo=timezone.utc),
+    )
+    assert events == []
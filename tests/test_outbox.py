@@ -0,0 +1,145 @@
+"""Tests for the durable write outbox."""
+import asyncio
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.rooster_money import outbox as outbox_module
+from custom_components.rooster_money.const import (
+    OUTBOX_BACKOFF_MAX,
+    OUTBOX_BACKOFF_MIN,
+    OUTBOX_MAX_ATTEMPTS,
+)
+from custom_components.rooster_money.outbox import RoosterOutbox, can_queue, never_sent
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+PARAMS = {"paused": True, "amount": 5.0}
+
+
+class FakeChild:
+    """A child account whose allowance updates fail with a given error."""
+
+    def __init__(self) -> None:
+        """Init the child."""
+        self.error: BaseException | None = None
+        self.sent: list[tuple[bool, float]] = []
+
+    async def update_allowance(self, paused: bool, amount: float) -> None:
+        """Record the update, or raise the configured error."""
+        if self.error is not None:
+            raise self.error
+        self.sent.append((paused, amount))
+
+
+def connect_error() -> aiohttp.ClientOSError:
+    """Return a connection error the way pyroostermoney re-raises it."""
+    error = aiohttp.ClientOSError()
+    error.__cause__ = aiohttp.ClientConnectorError(
+        SimpleNamespace(ssl=None, host="localhost", port=443), OSError(111, "refused")
+    )
+    return error
+
+
+def run_with_outbox(
+    tmp_path, test: Callable[[RoosterOutbox, FakeChild], Awaitable[None]]
+) -> None:
+    """Run a test against an enabled outbox of a single child."""
+
+    async def run() -> None:
+        hass = HomeAssistant()
+        hass.config.config_dir = str(tmp_path)
+        child = FakeChild()
+        rooster = SimpleNamespace(get_child_account=lambda child_id: child)
+
+        async def on_replayed() -> None:
+            """Do nothing after a replay."""
+
+        outbox = RoosterOutbox(hass, rooster, "entry", True, on_replayed)
+        with patch.object(outbox_module, "async_call_later"):
+            await test(outbox, child)
+
+    asyncio.run(run())
+
+
+def test_only_connection_failures_are_never_sent() -> None:
+    """A write may be replayed when it is idempotent or never left the host."""
+    assert never_sent(connect_error())
+    assert not never_sent(aiohttp.ClientOSError())
+    assert can_queue("boost_pot", connect_error())
+    assert not can_queue("boost_pot", asyncio.TimeoutError())
+    assert can_queue("update_allowance", asyncio.TimeoutError())
+
+
+def test_unreachable_writes_are_queued_and_coalesced(tmp_path) -> None:
+    """A later write to the same target replaces the queued one."""
+
+    async def test(outbox: RoosterOutbox, child: FakeChild) -> None:
+        child.error = aiohttp.ClientOSError()
+        assert not await outbox.async_submit("update_allowance", 1, PARAMS, "allowance_1")
+        assert not await outbox.async_submit(
+            "update_allowance", 1, {"paused": False, "amount": 6.0}, "allowance_1"
+        )
+        assert [item["params"]["amount"] for item in outbox.items] == [6.0]
+
+        child.error = None
+        await outbox._async_replay()
+
+        assert outbox.items == []
+        assert child.sent == [(False, 6.0)]
+
+    run_with_outbox(tmp_path, test)
+
+
+def test_auth_errors_are_raised_not_queued(tmp_path) -> None:
+    """A rejected session can never be replayed successfully."""
+
+    async def test(outbox: RoosterOutbox, child: FakeChild) -> None:
+        child.error = PermissionError("Unauthorized session")
+        with pytest.raises(HomeAssistantError):
+            await outbox.async_submit("update_allowance", 1, PARAMS, "allowance_1")
+        assert outbox.items == []
+
+    run_with_outbox(tmp_path, test)
+
+
+def test_unconfirmed_money_moves_are_not_queued(tmp_path) -> None:
+    """A pot boost that may have been applied fails instead of being queued."""
+
+    async def test(outbox: RoosterOutbox, child: FakeChild) -> None:
+        with pytest.raises(HomeAssistantError), patch.object(
+            outbox_module, "_boost_pot", side_effect=asyncio.TimeoutError
+        ), patch.dict(outbox_module.OPERATIONS, {"boost_pot": outbox_module._boost_pot}):
+            await outbox.async_submit("boost_pot", 1, {"pot_id": "p", "amount": 1})
+        assert outbox.items == []
+
+    run_with_outbox(tmp_path, test)
+
+
+def test_replay_backs_off_and_gives_up(tmp_path) -> None:
+    """Failed replays wait longer each time and drop the item at the cap."""
+
+    async def test(outbox: RoosterOutbox, child: FakeChild) -> None:
+        child.error = aiohttp.ClientOSError()
+        await outbox.async_submit("update_allowance", 1, PARAMS, "allowance_1")
+
+        delays = []
+        replays = 0
+        with patch.object(outbox_module, "async_call_later") as call_later:
+            while outbox.items:
+                replays += 1
+                await outbox._async_replay()
+                if call_later.call_args is not None:
+                    delays.append(call_later.call_args.args[1])
+                    call_later.reset_mock()
+
+        # the first attempt was made when the write was submitted
+        assert replays == OUTBOX_MAX_ATTEMPTS - 1
+        assert delays[0] == OUTBOX_BACKOFF_MIN * 2
+        assert delays == sorted(delays)
+        assert max(delays) <= OUTBOX_BACKOFF_MAX
+
+    run_with_outbox(tmp_path, test)
@@ -0,0 +1,73 @@
+"""Tests for the request rate limiter."""
+import asyncio
+
+import pytest
+
+from custom_components.rooster_money.rate_limit import (
+    RequestBudgetExhausted,
+    RoosterRateLimiter,
+    is_write,
+)
+
+
+def test_is_write() -> None:
+    """Anything but a GET, and any request with credentials, is a write."""
+    assert not is_write({"url": "api/parent/family/account"})
+    assert not is_write({"url": "api/parent/family/account", "method": "get"})
+    assert is_write({"url": "api/parent/child/1/pot", "method": "POST"})
+    assert is_write({"url": "api/user/login", "auth": ("user", "password")})
+
+
+def test_reads_leave_a_reserve_for_writes() -> None:
+    """Reads stop once only the write reserve is left, writes can still go."""
+
+    async def run() -> None:
+        limiter = RoosterRateLimiter(capacity=10, rate=0.001, write_reserve=5)
+        for _ in range(5):
+            await limiter.acquire(False)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire(False), 0.05)
+        for _ in range(5):
+            await asyncio.wait_for(limiter.acquire(True), 0.05)
+        assert limiter.used_today == 10
+
+    asyncio.run(run())
+
+
+def test_tokens_refill_over_time() -> None:
+    """Tokens are earned back at the configured rate up to the capacity."""
+
+    async def run() -> None:
+        limiter = RoosterRateLimiter(capacity=2, rate=100, write_reserve=0)
+        for _ in range(6):
+            await asyncio.wait_for(limiter.acquire(True), 1)
+        assert limiter.tokens <= limiter.capacity
+
+    asyncio.run(run())
+
+
+def test_budget_is_enforced_on_every_request() -> None:
+    """Once the daily budget is spent every request fails."""
+
+    async def run() -> None:
+        limiter = RoosterRateLimiter(daily_budget=3)
+        await limiter.acquire(False)
+        await limiter.acquire(True)
+        await limiter.acquire(True)
+        assert limiter.budget_remaining == 0
+        with pytest.raises(RequestBudgetExhausted):
+            await limiter.acquire(True)
+        with pytest.raises(RequestBudgetExhausted):
+            await limiter.acquire(False)
+
+    asyncio.run(run())
+
+
+def test_polls_stop_when_the_budget_runs_low() -> None:
+    """Background polls are skipped once less than a tenth of the budget is left."""
+    limiter = RoosterRateLimiter(daily_budget=100)
+    assert limiter.allow_poll()
+    limiter.used_today = 91
+    assert not limiter.allow_poll()
+    assert limiter.skipped_polls == 1
+    assert RoosterRateLimiter().allow_poll()
@@ -0,0 +1,122 @@
+"""Tests for the per-child write pipeline."""
+import asyncio
+from typing import Any
+
+import pytest
+
+from custom_components.rooster_money import writes as writes_module
+from custom_components.rooster_money.writes import RoosterWritePipeline
+
+KEY = "allowance_1"
+
+
+class FakeOutbox:
+    """An outbox that records what is sent after a short delay."""
+
+    def __init__(self) -> None:
+        """Init the outbox."""
+        self.items: list[dict[str, Any]] = []
+        self.sent: list[dict[str, Any]] = []
+        self.error: BaseException | None = None
+
+    async def async_submit(self, operation, child_id, params, coalesce_key=None):
+        """Send a write."""
+        await asyncio.sleep(0.02)
+        if self.error is not None:
+            raise self.error
+        self.sent.append(params)
+        return True
+
+
+@pytest.fixture(autouse=True)
+def short_window(monkeypatch) -> None:
+    """Shorten the coalescing window."""
+    monkeypatch.setattr(writes_module, "WRITE_COALESCE_WINDOW", 0.05)
+
+
+def submit(pipeline: RoosterWritePipeline, paused: bool, amount: float = 5.0):
+    """Start an allowance write."""
+    return asyncio.create_task(
+        pipeline.async_submit(
+            "update_allowance",
+            1,
+            {"paused": paused, "amount": amount},
+            coalesce_key=KEY,
+            optimistic=not paused,
+        )
+    )
+
+
+def test_lone_write_is_sent_straight_away() -> None:
+    """Nothing waits for the coalescing window without a pending write."""
+
+    async def run() -> None:
+        outbox = FakeOutbox()
+        pipeline = RoosterWritePipeline(outbox, lambda: None)
+        await asyncio.wait_for(submit(pipeline, True), 0.04)
+        assert outbox.sent == [{"paused": True, "amount": 5.0}]
+
+    asyncio.run(run())
+
+
+def test_burst_sends_first_and_latest_write() -> None:
+    """Writes queued behind a pending one collapse into the latest."""
+
+    async def run() -> None:
+        outbox = FakeOutbox()
+        pipeline = RoosterWritePipeline(outbox, lambda: None)
+        tasks = [submit(pipeline, True)]
+        await asyncio.sleep(0)
+        tasks += [submit(pipeline, False), submit(pipeline, True), submit(pipeline, False)]
+        await asyncio.sleep(0)
+        assert pipeline.override(KEY, None) is True
+        await asyncio.gather(*tasks)
+        assert [params["paused"] for params in outbox.sent] == [True, False]
+
+    asyncio.run(run())
+
+
+def test_override_lasts_until_a_later_refresh() -> None:
+    """Only a refresh that started after the write settled takes over."""
+
+    async def run() -> None:
+        outbox = FakeOutbox()
+        pipeline = RoosterWritePipeline(outbox, lambda: None)
+        task = submit(pipeline, False, 9.0)
+        await asyncio.sleep(0)
+        stale = pipeline.settled()
+        await task
+        pipeline.async_reconcile(stale)
+        assert pipeline.override(KEY, None) is True
+        assert pipeline.pending_params(KEY, {})["amount"] == 9.0
+
+        pipeline.async_reconcile(pipeline.settled())
+        assert pipeline.override(KEY, None) is None
+        assert pipeline.pending_params(KEY, {}) == {}
+
+    asyncio.run(run())
+
+
+def test_failed_write_drops_its_override() -> None:
+    """The refreshed value shows again when the latest write fails."""
+
+    async def run() -> None:
+        outbox = FakeOutbox()
+        outbox.error = RuntimeError("failed")
+        changes = []
+        pipeline = RoosterWritePipeline(outbox, lambda: changes.append(True))
+        with pytest.raises(RuntimeError):
+            await submit(pipeline, False)
+        assert pipeline.override(KEY, "refreshed") == "refreshed"
+        assert len(changes) == 2
+
+    asyncio.run(run())
+
+
+def test_pending_params_fall_back_to_the_outbox() -> None:
+    """A queued write is still pending after a restart."""
+    outbox = FakeOutbox()
+    outbox.items = [{"coalesce_key": KEY, "params": {"paused": True, "amount": 7.0}}]
+    pipeline = RoosterWritePipeline(outbox, lambda: None)
+    assert pipeline.pending_params(KEY, {})["amount"] == 7.0
+    assert pipeline.pending_params("card_1", {"active": True}) == {"active": True}